@@ -0,0 +1,233 @@
+"""HTTP JSON API for contract generation, for systems that can't drive the UI.
+
+    python api_server.py --port 8600 --workers 4 --queue 16
+
+    curl -X POST localhost:8600/v1/contracts?format=pdf -o contract.pdf \
+         -d '{"provider_name": "Amit Kumar", "client_name": "Tech Solutions", "category": "Web Development"}'
+
+The body takes the same fields as the app's tabs (and batch_generate.py rows):
+provider_name, client_name and category are required; jurisdiction,
+project_fee, hourly_rate, advance_percent, gst_registered and scope are
+optional. The response is the PDF or DOCX file itself.
+
+PDFs take two more query parameters: profile=standard|lightweight|minimal
+(see contract_engine.PDF_PROFILES) and max_bytes, a size budget met by
+stepping down to lighter profiles.
+
+Built on the standard library only: a threading HTTP/1.1 server with
+keep-alive, in front of the same bounded RenderWorker the app uses. Renderers
+are warmed up (logo decoded, fonts and DOCX skeleton loaded) before the port
+opens; when every worker is busy and the queue is full, requests get a 429
+with Retry-After instead of piling up.
+"""
+import argparse
+import http.server
+import json
+import os
+import sys
+import urllib.parse
+
+import contract_engine
+from batch_generate import normalize_row
+from render_cache import ContractCache, contract_key
+from render_worker import Overloaded, RenderWorker
+from telemetry import TELEMETRY, increment, service_gauges
+
+# Largest request body accepted; a long Scope of Work is still far below this
+MAX_BODY_BYTES = 5 * 1024 * 1024
+# Seconds an idle keep-alive connection is held open
+KEEP_ALIVE_TIMEOUT = 30
+# Seconds a request may wait for its render before giving up with a 503
+RENDER_TIMEOUT = 60
+RETRY_AFTER_SECONDS = 1
+
+CONTENT_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+class APIError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+# --- RENDERING ---
+def render_document(row, fmt, docx_backend=None, pdf_profile=None, max_bytes=None):
+    """Build the contract for a normalized row and return the file bytes."""
+    contract = contract_engine.build_contract(
+        row["provider_name"], row["client_name"], row["jurisdiction"], row["project_fee"],
+        row["hourly_rate"], row["advance_percent"], row["gst_registered"], row["category"], row["scope"],
+    )
+    if fmt == "pdf":
+        return contract_engine.create_professional_pdf(contract, profile=pdf_profile, max_bytes=max_bytes)
+    with contract_engine.create_professional_docx(contract, docx_backend) as docx:
+        return docx.read()
+
+class ContractService:
+    """Validation, caching and rendering shared by every connection thread."""
+
+    def __init__(self, worker, cache, docx_backend=None):
+        self.worker = worker
+        self.cache = cache
+        self.docx_backend = docx_backend
+
+    def generate(self, payload, fmt, pdf_profile=None, max_bytes=None):
+        if fmt not in CONTENT_TYPES:
+            raise APIError(400, f"format must be one of {', '.join(CONTENT_TYPES)}")
+        if pdf_profile is not None and pdf_profile not in contract_engine.PDF_PROFILES:
+            raise APIError(400, f"profile must be one of {', '.join(contract_engine.PDF_PROFILES)}")
+        if not isinstance(payload, dict):
+            raise APIError(400, "request body must be a JSON object")
+        try:
+            row = normalize_row(payload)
+        except (ValueError, TypeError, OverflowError) as e:
+            raise APIError(400, str(e))
+        key = contract_key(
+            row["provider_name"], row["client_name"], row["jurisdiction"], row["project_fee"], row["hourly_rate"],
+            row["advance_percent"], row["gst_registered"], row["category"], row["scope"],
+        ) + f":{fmt}"
+        if fmt == "docx":
+            key += f":{self.docx_backend or contract_engine.DOCX_BACKEND}"
+        else:
+            key += f":{pdf_profile or contract_engine.PDF_PROFILE}:{max_bytes}"
+        data = self.cache.get(key)
+        if data is None:
+            render = lambda: render_document(row, fmt, self.docx_backend, pdf_profile, max_bytes)
+            job = self.worker.submit(key, self.cache.get_or_render, key, render)
+            data = job.result(RENDER_TIMEOUT)
+        return data
+
+    def health(self):
+        return {"status": "ok", "workers": self.worker.stats(), "cache": self.cache.stats()}
+
+    def metrics(self, fmt="prometheus"):
+        gauges = service_gauges(self.cache, self.worker)
+        if fmt == "json":
+            return dict(TELEMETRY.snapshot(), gauges=gauges)
+        return TELEMETRY.prometheus_text(gauges)
+
+# --- HTTP ---
+class ContractRequestHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "FreelanceShieldAPI/1.0"
+    timeout = KEEP_ALIVE_TIMEOUT
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        if url.path == "/healthz":
+            self._send_json(200, self.server.service.health())
+        elif url.path == "/metrics":
+            if urllib.parse.parse_qs(url.query).get("format") == ["json"]:
+                self._send_json(200, self.server.service.metrics("json"))
+            else:
+                self._send(200, self.server.service.metrics().encode("utf-8"), "text/plain; version=0.0.4")
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        url = urllib.parse.urlsplit(self.path)
+        try:
+            if url.path != "/v1/contracts":
+                # The body is never read, so it can't stay on a kept-alive connection
+                self.close_connection = True
+                raise APIError(404, "not found")
+            payload = self._read_json()
+            query = urllib.parse.parse_qs(url.query)
+            fmt = str(query.get("format", [None])[0] or (payload.get("format") if isinstance(payload, dict) else None) or "pdf").lower()
+            profile = query.get("profile", [None])[0]
+            try:
+                max_bytes = int(query["max_bytes"][0]) if "max_bytes" in query else None
+            except ValueError:
+                raise APIError(400, "max_bytes must be an integer")
+            data = self.server.service.generate(payload, fmt, profile, max_bytes)
+        except APIError as e:
+            self._send_json(e.status, {"error": str(e)})
+        except Overloaded:
+            self._send_json(429, {"error": "all render workers are busy, retry shortly"}, {"Retry-After": str(RETRY_AFTER_SECONDS)})
+        except TimeoutError:
+            self._send_json(503, {"error": "rendering timed out"})
+        except Exception as e:
+            self.log_error("render failed: %r", e)
+            self._send_json(500, {"error": "internal error"})
+        else:
+            self._send(200, data, CONTENT_TYPES[fmt], {"Content-Disposition": f'attachment; filename="Contract.{fmt}"'})
+
+    def _read_json(self):
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            # Without a length we can't find the end of the body on a kept-alive connection
+            self.close_connection = True
+            raise APIError(411, "Content-Length required")
+        if length < 0:
+            self.close_connection = True
+            raise APIError(400, "Content-Length must not be negative")
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise APIError(413, f"request body larger than {MAX_BODY_BYTES} bytes")
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, UnicodeDecodeError):
+            raise APIError(400, "request body is not valid JSON")
+        return payload
+
+    def _send_json(self, status, body, headers=None):
+        self._send(status, json.dumps(body).encode("utf-8"), "application/json", headers)
+
+    def _send(self, status, data, content_type, headers=None):
+        increment("http_responses_total", status=status)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+class ContractHTTPServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    # Let a burst of connections queue in the kernel while workers are busy
+    request_queue_size = 128
+
+    def __init__(self, address, service, quiet=False):
+        super().__init__(address, ContractRequestHandler)
+        self.service = service
+        self.quiet = quiet
+
+def create_server(host="127.0.0.1", port=8600, workers=None, queue=None, docx_backend=None, cache_mb=64, quiet=False):
+    """Warm the renderers and return a ready-to-serve ContractHTTPServer (port 0 picks a free port)."""
+    contract_engine.warm_up()
+    worker = RenderWorker(max_workers=workers, max_queue=queue)
+    cache = ContractCache(max_bytes=cache_mb * 1024 * 1024)
+    return ContractHTTPServer((host, port), ContractService(worker, cache, docx_backend), quiet)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Freelance Shield contract generation over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8600, help="port to listen on (default: 8600)")
+    parser.add_argument("--workers", type=int, default=None, help="concurrent renders (default: $FREELANCE_SHIELD_RENDER_WORKERS or 2)")
+    parser.add_argument("--queue", type=int, default=None, help="renders allowed to wait before answering 429 (default: $FREELANCE_SHIELD_RENDER_QUEUE or 8)")
+    parser.add_argument("--docx-backend", choices=contract_engine.DOCX_BACKENDS, default=None, help="DOCX renderer (default: $FREELANCE_SHIELD_DOCX_BACKEND or python-docx)")
+    parser.add_argument("--cache-mb", type=int, default=int(os.environ.get("FREELANCE_SHIELD_CACHE_MB", "64")), help="rendered-document cache size (default: 64)")
+    parser.add_argument("--quiet", action="store_true", help="don't log every request")
+    args = parser.parse_args(argv)
+
+    server = create_server(args.host, args.port, args.workers, args.queue, args.docx_backend, args.cache_mb, args.quiet)
+    print(f"Serving on http://{args.host}:{server.server_address[1]} with {server.service.worker.max_workers} render workers", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.worker.shutdown(wait=False)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,23 @@
 import streamlit as st
-from fpdf import FPDF
-from docx import Document
-from docx.shared import Pt, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import datetime
 import os
 import time
-import io
+from contract_engine import scope_templates, build_contract, create_professional_pdf, create_professional_docx, estimate_pdf, penalty_paragraph, prewarm_in_background
+from contract_model import PaymentTerms, PreviewMemo
+from render_cache import ContractCache, contract_key
+from render_worker import Overloaded, RenderWorker, report_progress
+from static_assets import background_css, build_static_assets
+from telemetry import TELEMETRY, increment, service_gauges, timed
 
 # --- 1. SETUP & CONFIG ---
-icon_path = "logo.png"
-page_icon = icon_path if os.path.exists(icon_path) else "🛡️"
+@st.cache_resource(show_spinner=False)
+def get_static_assets():
+    # Resized WebP/JPEG/PNG copies of the images, generated once per server process
+    return build_static_assets()
+
+static_assets = get_static_assets()
+page_icon = static_assets["favicon"] if os.path.exists(static_assets["favicon"]) else "🛡️"
 
 st.set_page_config(
     page_title="Freelance Shield Pro",
@@ -20,13 +27,12 @@ st.set_page_config(
 )
 
 # --- 2. CUSTOM CSS ---
+st.markdown(f"<style>{background_css(static_assets)}</style>", unsafe_allow_html=True)
 st.markdown(
     """
     <style>
         /* BACKGROUND */
         .stApp {
-            background-image: linear-gradient(rgba(10, 10, 20, 0.85), rgba(10, 10, 20, 0.90)), 
-            url("https://raw.githubusercontent.com/mamamooze/freelance-shield/main/background.png");
             background-size: cover;
             background-attachment: fixed;
         }
@@ -157,157 +163,18 @@ if 'advance_rate' not in st.session_state: st.session_state.advance_rate = 50
 if 'slider_key' not in st.session_state: st.session_state.slider_key = 50
 if 'num_key' not in st.session_state: st.session_state.num_key = 50
 if 'scope_text' not in st.session_state: st.session_state.scope_text = ""
+if 'preview_memo' not in st.session_state: st.session_state.preview_memo = PreviewMemo()
+if 'rerun_counts' not in st.session_state: st.session_state.rerun_counts = {"full": 0, "partial": 0, "timer": 0}
 
-# --- HELPER FUNCTIONS ---
-def clean_text_for_pdf(text):
-    """Remove all characters that can't be encoded in latin-1"""
-    replacements = {
-        '₹': 'Rs. ', '—': '-', '–': '-', '"': '"', '"': '"',
-        "‘": "'", "’": "'", '…': '...', '•': '-', '═': '=',
-        '\u201c': '"', '\u201d': '"', '\u2018': "'", '\u2019': "'"
-    }
-    for old, new in replacements.items():
-        text = text.replace(old, new)
-    try:
-        text.encode('latin-1')
-        return text
-    except UnicodeEncodeError:
-        return ''.join(char if ord(char) < 256 else '?' for char in text)
-
-def create_professional_pdf(full_text, annexure_text, provider_name, client_name):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_auto_page_break(auto=True, margin=15)
-    
-    if os.path.exists("logo.png"):
-        try:
-            pdf.image("logo.png", 10, 8, 25)
-            pdf.ln(25)
-        except:
-            pdf.ln(5)
-    
-    pdf.set_font('Arial', 'B', 16)
-    pdf.cell(0, 10, 'PROFESSIONAL SERVICE AGREEMENT', 0, 1, 'C')
-    pdf.ln(5)
-    
-    pdf.set_font('Arial', '', 11)
-    pdf.cell(0, 8, f"Date: {datetime.date.today().strftime('%B %d, %Y')}", 0, 1, 'C')
-    pdf.ln(5)
-    
-    clean_full_text = clean_text_for_pdf(full_text)
-    clean_annexure = clean_text_for_pdf(annexure_text)
-    clean_provider = clean_text_for_pdf(provider_name)
-    clean_client = clean_text_for_pdf(client_name)
-    
-    lines = clean_full_text.split('\n')
-    for line in lines:
-        line = line.strip()
-        if not line: continue
-        if line and len(line) > 2 and line[0].isdigit() and '.' in line[:3]:
-            pdf.set_font('Arial', 'B', 12)
-            pdf.set_fill_color(240, 240, 240)
-            pdf.cell(0, 8, line[:80], 0, 1, 'L', 1)
-            pdf.ln(2)
-        elif 'SIGNED BY' in line or 'SIGNATURE' in line.upper():
-            pdf.ln(3)
-            pdf.set_font('Arial', 'B', 11)
-            pdf.cell(0, 6, line[:150], 0, 1)
-        elif line.startswith('===') or line.startswith('---'):
-            pdf.ln(2)
-        else:
-            pdf.set_font('Arial', '', 10)
-            if len(line) > 90:
-                pdf.multi_cell(0, 5, line)
-            else:
-                pdf.cell(0, 5, line, 0, 1)
-    
-    pdf.add_page()
-    pdf.set_font('Arial', 'B', 14)
-    pdf.cell(0, 10, 'ANNEXURE A: SCOPE OF WORK', 0, 1, 'L')
-    pdf.ln(5)
-    pdf.set_font('Arial', '', 10)
-    pdf.multi_cell(0, 5, clean_annexure)
-    
-    pdf.ln(10)
-    pdf.cell(0, 6, '_________________________________________________________________', 0, 1)
-    pdf.ln(5)
-    pdf.cell(0, 6, 'Provider Signature: ________________________  Date: __________', 0, 1)
-    pdf.cell(0, 6, f'Name: {clean_provider}', 0, 1)
-    pdf.ln(5)
-    pdf.cell(0, 6, 'Client Signature: ________________________  Date: __________', 0, 1)
-    pdf.cell(0, 6, f'Name: {clean_client}', 0, 1)
-    
-    return pdf.output(dest='S').encode('latin-1', errors='replace')
-
-def create_professional_docx(full_text, annexure_text, provider_name, client_name):
-    doc = Document()
-    title = doc.add_heading('PROFESSIONAL SERVICE AGREEMENT', 0)
-    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    title_run = title.runs[0]
-    title_run.font.size = Pt(18)
-    title_run.font.color.rgb = RGBColor(37, 99, 235)
-    
-    date_para = doc.add_paragraph()
-    date_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    date_run = date_para.add_run(f"Date: {datetime.date.today().strftime('%B %d, %Y')}")
-    date_run.font.size = Pt(11)
-    doc.add_paragraph()
-    
-    for line in full_text.split('\n'):
-        line = line.strip()
-        if not line: continue
-        if line and line[0].isdigit() and '.' in line[:3]:
-            heading = doc.add_heading(line, level=2)
-            heading_run = heading.runs[0]
-            heading_run.font.size = Pt(13)
-            heading_run.font.color.rgb = RGBColor(30, 41, 59)
-        elif 'SIGNED BY' in line or 'Signature:' in line or 'Date:' in line:
-            sig_para = doc.add_paragraph(line)
-            sig_para.runs[0].font.size = Pt(11)
-            sig_para.runs[0].bold = True
-        else:
-            para = doc.add_paragraph(line)
-            para.runs[0].font.size = Pt(11)
-    
-    doc.add_page_break()
-    annexure_title = doc.add_heading('ANNEXURE A: SCOPE OF WORK', 1)
-    annexure_title.runs[0].font.color.rgb = RGBColor(37, 99, 235)
-    
-    for line in annexure_text.split('\n'):
-        if line.strip():
-            para = doc.add_paragraph(line.strip())
-            para.runs[0].font.size = Pt(11)
-    
-    doc.add_paragraph()
-    doc.add_paragraph('_' * 60)
-    sig_section = doc.add_paragraph()
-    sig_section.add_run(f'\nProvider Signature: _____________________ Date: __________\n')
-    sig_section.add_run(f'Name: {provider_name}\n\n')
-    sig_section.add_run(f'Client Signature: _____________________ Date: __________\n')
-    sig_section.add_run(f'Name: {client_name}')
-    
-    buffer = io.BytesIO()
-    doc.save(buffer)
-    buffer.seek(0)
-    return buffer
-
-# --- TEMPLATES ---
-scope_templates = {
-    "Select a template...": "",
-    "✍️ Content Writing": """DELIVERABLE: 4 SEO Blog Articles (1000 words each)\n- FORMAT: .docx, Grammarly score >90\n- TOPICS: Approved by Client in advance\n- DELIVERY: 2 articles/week via email\n- REVISIONS: 1 round included per article\n- EXCLUSIONS: No image sourcing, keyword research, or posting""",
-    "🎨 Graphic Design": """DELIVERABLE: Logo (PNG/SVG), Business Card (PDF), Banner\n- BRIEF: Colors/Fonts provided by Client\n- REVISIONS: 3 feedback rounds included (within 2 days)\n- DELIVERY: Final files via Google Drive in 7 days\n- EXCLUSIONS: No printing costs or stock image purchase""",
-    "🖼️ UI/UX & Web Design": """DELIVERABLE: Wireframe + UI Kit (5 Screens)\n- FORMAT: Figma/Sketch/XD files\n- TIMELINE: Initial draft in 5 days\n- REVISIONS: 2 rounds included\n- EXCLUSIONS: No coding/development included""",
-    "💻 Web Development": """DELIVERABLE: 5-Page Responsive Website (WordPress)\n- SPECS: Speed score >80, Contact Form, About Page\n- DELIVERY: Staging link for review, ZIP files after payment\n- REVISIONS: 2 rounds included\n- EXCLUSIONS: Domain/Hosting fees and content writing not included""",
-    "📱 App Development": """DELIVERABLE: Android App MVP (5 Core Features)\n- SPECS: Compiles on Android 11+, Source Code included\n- TIMELINE: Weekly sprints, 30-day bug fix warranty\n- EXCLUSIONS: Google Play Store upload fees not included""",
-    "🎥 Video Editing": """DELIVERABLE: Edit 2 YouTube Videos (max 8 mins)\n- FORMAT: MP4, 1080p, Color Graded\n- TIMELINE: Draft within 48 hours of receiving raw files\n- REVISIONS: 2 feedback rounds included\n- EXCLUSIONS: No captions, thumbnails, or stock footage""",
-    "📱 Social Media Marketing": """DELIVERABLE: 12 Static Posts + 4 Reels (Monthly)\n- FORMAT: PNG (1080px) and MP4 (<60s)\n- SCHEDULE: 3 posts/week, approved by 25th of prev month\n- REVISIONS: 2 rounds per month included\n- EXCLUSIONS: No paid ad management or community replies""",
-    "📈 SEO & Digital Marketing": """DELIVERABLE: SEO Audit (20 pages) + Keyword Plan\n- FORMAT: PDF Report, Excel Sheet\n- SPECS: 30 priority keywords, competitor analysis\n- REVISIONS: 1 round included\n- EXCLUSIONS: On-page implementation and backlinks not included""",
-    "📧 Virtual Assistance": """DELIVERABLE: Daily Admin Tasks (Email/Calendar)\n- REPORTING: Daily Excel report, Inbox cleared\n- AVAILABILITY: Mon-Fri, 9am-5pm\n- EXCLUSIONS: No calls, travel booking, or personal errands""",
-    "📸 Photography": """DELIVERABLE: 50 Product Shots (Edited)\n- FORMAT: High-res JPEGs, 3000px, White Background\n- TIMELINE: Edits delivered in 3 days\n- REVISIONS: 1 re-edit round per batch of 10\n- EXCLUSIONS: No props, prints, or location booking fees""",
-    "🗣️ Translation": """DELIVERABLE: Translate 10k words (Eng-Hindi) + 2 Transcripts\n- FORMAT: Word/TXT files\n- ACCURACY: >98% standard\n- REVISIONS: 1 review round included\n- EXCLUSIONS: No subtitling or legal localization""",
-    "🎙️ Voice-Over": """DELIVERABLE: 3 Commercial Voice-overs (30s) + 1 Podcast Edit\n- FORMAT: WAV/MP3, Commercial rights included\n- SCRIPT: Supplied by Client\n- REVISIONS: 1 correction round included\n- EXCLUSIONS: No music production or mixing"""
-}
+# Only full reruns execute the top level of the script
+st.session_state.rerun_counts["full"] += 1
+increment("reruns_total", kind="full")
+
+OTHER_CITY = "Other (Type Manually)"
+# RBI Bank Rate pre-filled for the late-payment illustration; users can update it
+DEFAULT_BANK_RATE = 5.75
 
+# --- CALLBACKS ---
 def update_scope():
     if st.session_state.template_selector != "Select a template...":
         st.session_state.scope_text = scope_templates[st.session_state.template_selector]
@@ -315,37 +182,169 @@ def update_scope():
 def update_from_slider(): st.session_state.num_key = st.session_state.slider_key
 def update_from_num(): st.session_state.slider_key = st.session_state.num_key
 
-def get_smart_clauses(category, rate):
-    clauses = {
-        "acceptance": f"Client review within 5 days. Silence = Acceptance. 2 revisions included. Extra changes billed at {rate}/hr.",
-        "warranty": "Provided 'as-is'. No post-delivery support unless specified in Annexure A.",
-        "ip_rights": "Client owns IP only AFTER full payment. Use before payment is Copyright Infringement.",
-        "cancellation": "Cancellation after work starts incurs forfeiture of the Advance Payment.",
-        "termination": "Provider may terminate with 7 days written notice if Client breaches payment terms."
-    }
-    if category in ["💻 Web Development", "📱 App Development"]:
-        clauses["warranty"] = f"BUG FIX WARRANTY: Provider agrees to fix critical bugs reported within 30 days. Feature changes billed at {rate}/hr."
-        clauses["ip_rights"] = "CODE OWNERSHIP: Client receives full source code rights upon payment. Provider retains rights to generic libraries."
-    elif category in ["🎨 Graphic Design", "🎥 Video Editing", "🖼️ UI/UX & Web Design", "📸 Photography"]:
-        clauses["acceptance"] = "CREATIVE APPROVAL: Rejections based on 'personal taste' after initial approval billed as Change Order."
-        clauses["ip_rights"] = "SOURCE FILES: Final deliverables transfer upon payment. Raw source files remain property of Provider unless purchased."
-    elif category in ["📱 Social Media Marketing", "📈 SEO & Digital Marketing"]:
-        clauses["warranty"] = "NO ROI GUARANTEE: Provider does NOT guarantee specific results (Likes, Sales, Rankings)."
-        clauses["acceptance"] = "APPROVAL WINDOW: Content must be approved 24 hours prior to publishing deadlines."
-    elif category in ["✍️ Content Writing", "🗣️ Translation"]:
-        clauses["warranty"] = "ORIGINALITY WARRANTY: Provider warrants that work is original."
-        clauses["acceptance"] = "EDITORIAL REVIEW: Client has 3 days for factual corrections."
-    elif category == "🎙️ Voice-Over":
-        clauses["acceptance"] = "CORRECTION POLICY: Includes 1 round for pronunciation errors. Script changes require a new fee."
-        clauses["cancellation"] = "KILL FEE: 50% fee if cancelled after start. 100% fee if cancelled after recording."
-    elif category == "🗣️ Translation":
-        clauses["warranty"] = "ACCURACY WARRANTY: Provider guarantees >98% accuracy. Errors discovered within 7 days will be fixed free."
-        clauses["cancellation"] = "KILL FEE: Cancellation after start incurs 50% fee. Cancellation after draft delivery incurs 100% fee."
-    return clauses
+def count_partial_rerun():
+    """Called at the top of each input fragment; counts the runs that skipped the rest of the page."""
+    ctx = get_script_run_ctx()
+    if ctx is not None and ctx.fragment_ids_this_run:
+        st.session_state.rerun_counts["partial"] += 1
+        increment("reruns_total", kind="partial")
+
+@st.cache_resource
+def get_output_cache():
+    # One cache for every session, bounded by total bytes rather than entry count; large files spill to disk
+    return ContractCache(max_bytes=int(os.environ.get("FREELANCE_SHIELD_CACHE_MB", "64")) * 1024 * 1024)
+
+def cache_owner():
+    """This session's owner id in the output cache.
+
+    The lease lives in session state, so when Streamlit discards the session
+    it is garbage collected and the session's cached documents go with it.
+    """
+    if 'cache_lease' not in st.session_state:
+        st.session_state.cache_lease = get_output_cache().lease(get_script_run_ctx().session_id)
+    return st.session_state.cache_lease.owner
+
+@st.cache_resource
+def get_render_worker():
+    # Shared by every session so the total rendering load on the instance stays bounded
+    return RenderWorker()
+
+# Seconds a download click waits for its render before failing instead of holding the thread
+DOWNLOAD_TIMEOUT = 60
+
+def lazy_document(cache, key, render, owner=None):
+    """Download callback that renders one format on first click and serves cached bytes afterwards.
+
+    The session only holds this callable; the bytes live in the shared cache.
+    Like Generate, a click that finds the worker queue full is turned away
+    rather than rendered outside the worker's bound.
+    """
+    def load():
+        data = cache.get(key, owner)
+        if data is not None:
+            return data
+        try:
+            return get_render_worker().run(key, cache.get_or_render, key, render, owner, timeout=DOWNLOAD_TIMEOUT)
+        except Overloaded:
+            raise RuntimeError("Lots of freelancers are generating contracts right now. Please click Download again in a few seconds.")
+        except TimeoutError:
+            # The job keeps running and fills the cache, so the next click is served from there
+            raise RuntimeError("Your document is still being prepared. Please click Download again in a moment.")
+    return load
+
+def draft_contract(cache, key, *inputs, owner=None):
+    """Render-worker job: build the contract and its preview text."""
+    report_progress(0.2, "Applying smart clauses...")
+    contract = build_contract(*inputs)
+    preview = cache.get(f"{key}:preview", owner)
+    if preview is None:
+        report_progress(0.6, "Drafting the preview...")
+        with timed("stage_seconds", stage="preview"):
+            preview = contract.preview_text().encode("utf-8")
+        cache.put(f"{key}:preview", preview, owner)
+    return contract, preview.decode("utf-8")
+
+def penalty_example_from_state():
+    state = st.session_state
+    if not state.get("penalty_on"):
+        return None
+    return (state.get("bank_rate", DEFAULT_BANK_RATE), state.get("days_late", 90))
+
+def current_inputs():
+    """Form values as build_contract() arguments, read from widget state so any fragment can see them."""
+    state = st.session_state
+    city = state.get("jurisdiction_other", "") if state.jurisdiction_choice == OTHER_CITY else state.jurisdiction_choice
+    return (
+        state.provider_name, state.client_name, city, state.project_fee, state.hourly_rate,
+        state.slider_key, state.gst_registered, state.template_selector, state.scope_text,
+        penalty_example_from_state(),
+    )
+
+def preview_on():
+    return st.session_state.get("live_preview_on", False)
+
+def refresh_preview(inputs):
+    """Bring the preview memo up to date with `inputs`; returns whether anything was re-rendered."""
+    if inputs == st.session_state.get("preview_inputs"):
+        return False
+    memo = st.session_state.preview_memo
+    with timed("stage_seconds", stage="live_preview"):
+        memo.update(build_contract(*inputs))
+    st.session_state.preview_inputs = inputs
+    # Laid out but not drawn, so the page count is known before anyone clicks Generate
+    st.session_state.preview_pages = estimate_pdf(memo.document, st.session_state.get("pdf_profile"))[0]
+    # Generate reuses this text instead of drafting the preview again
+    key = contract_key(*inputs)
+    get_output_cache().put(f"{key}:preview", memo.text.encode("utf-8"), cache_owner())
+    return True
+
+def sync_live_preview():
+    """Called at the end of each input fragment; redraws the page only when an edit changed the preview.
+
+    The preview sits outside the tab fragments, so a tab's partial rerun can't
+    draw it. When the edit changed the contract the whole page reruns once to
+    show it; edits that leave the preview as it was stay partial.
+    """
+    if not preview_on():
+        return
+    ctx = get_script_run_ctx()
+    if ctx is None or not ctx.fragment_ids_this_run:
+        # Full rerun: live_preview() runs later in this same pass
+        return
+    inputs = current_inputs()
+    if inputs[7] != "Select a template..." and refresh_preview(inputs):
+        st.rerun()
+
+def live_preview():
+    inputs = current_inputs()
+    if inputs[7] == "Select a template...":
+        st.caption("Select an industry template to see the contract take shape.")
+        return
+    refresh_preview(inputs)
+    st.text_area("Live contract preview", value=st.session_state.preview_memo.text, height=400, label_visibility="collapsed")
+    pages = st.session_state.get("preview_pages")
+    if pages:
+        st.caption(f"📄 {pages} page{'s' if pages != 1 else ''} as a PDF")
+
+@st.fragment(run_every=2)
+def rerun_debug_panel():
+    # Refreshes itself so partial reruns elsewhere show up; its own ticks are counted as timer reruns
+    counts = st.session_state.rerun_counts
+    counts["timer"] += 1
+    increment("reruns_total", kind="timer")
+    st.caption(f"🐞 Reruns this session: {counts['full']} full, {counts['partial']} partial, {counts['timer']} timer")
+
+def is_admin():
+    # Hidden panel: only shown with ?admin=<FREELANCE_SHIELD_ADMIN_TOKEN>, and never when the token is unset
+    token = os.environ.get("FREELANCE_SHIELD_ADMIN_TOKEN")
+    return bool(token) and st.query_params.get("admin") == token
+
+def telemetry_panel():
+    """Timings, sizes and counts only; telemetry never sees names, fees or scope text."""
+    snapshot = TELEMETRY.snapshot()
+    gauges = service_gauges(get_output_cache(), get_render_worker())
+    st.markdown("### 📊 Performance Telemetry")
+    st.caption(f"Process uptime: {snapshot['uptime_seconds'] / 60:.0f} min")
+    rows = [
+        {
+            "series": series,
+            "count": h["count"],
+            "mean": h["mean"],
+            "p50": h["p50"],
+            "p95": h["p95"],
+            "p99": h["p99"],
+            "max": h["max"],
+        }
+        for series, h in sorted(snapshot["histograms"].items())
+    ]
+    if rows:
+        st.dataframe(rows, hide_index=True, width="stretch")
+    st.json({"counters": snapshot["counters"], "gauges": gauges}, expanded=False)
+    st.download_button("Download Prometheus metrics", TELEMETRY.prometheus_text(gauges), file_name="metrics.txt", mime="text/plain", on_click="ignore")
 
 # --- 4. SIDEBAR ---
 with st.sidebar:
-    if os.path.exists("logo.png"): st.image("logo.png", width=120)
+    if os.path.exists(static_assets["logo"]): st.image(static_assets["logo"], width=120)
     
     st.markdown("### 🎯 Founder’s Mission")
     st.write("**Hi, I'm a Law Student working to empower Indian freelancers.**")
@@ -377,6 +376,13 @@ with st.sidebar:
         - **No Database:** All generation happens instantly in your active browser session. Once you close the tab, your data is permanently wiped.
         - **No Third Parties:** We do not sell or trade user data because we do not collect it.
         """)
+    
+    if st.query_params.get("debug") == "1":
+        rerun_debug_panel()
+    
+    if is_admin():
+        st.markdown("---")
+        telemetry_panel()
 
 # --- 5. MAIN UI ---
 c1, c2 = st.columns([2, 1])
@@ -402,26 +408,38 @@ st.markdown("---")
 
 tab1, tab2, tab3 = st.tabs(["👤 The Parties", "🎯 The Work (Scope)", "💰 The Money"])
 
-with tab1:
+# Each tab is a fragment: typing in it reruns only that tab, not the CSS, sidebar and hero.
+# On full reruns the fragments run inline and return their values to the Generate step.
+@st.fragment
+def parties_tab():
+    count_partial_rerun()
     c1, c2 = st.columns(2)
     with c1:
-        freelancer_name = st.text_input("Provider Name (You)", "Amit Kumar", help="Name on your Bank Account")
-        cities = ["Bengaluru, Karnataka", "New Delhi, Delhi", "Mumbai, Maharashtra", "Chennai, Tamil Nadu", "Hyderabad, Telangana", "Pune, Maharashtra", "Kolkata, West Bengal", "Other (Type Manually)"]
-        selected_city = st.selectbox("Your City (Jurisdiction)", cities, help="Where do you want to fight if they don't pay?")
-        jurisdiction_city = st.text_input("Type City", "Mysuru") if selected_city == "Other (Type Manually)" else selected_city
+        freelancer_name = st.text_input("Provider Name (You)", "Amit Kumar", key="provider_name", help="Name on your Bank Account")
+        cities = ["Bengaluru, Karnataka", "New Delhi, Delhi", "Mumbai, Maharashtra", "Chennai, Tamil Nadu", "Hyderabad, Telangana", "Pune, Maharashtra", "Kolkata, West Bengal", OTHER_CITY]
+        selected_city = st.selectbox("Your City (Jurisdiction)", cities, key="jurisdiction_choice", help="Where do you want to fight if they don't pay?")
+        jurisdiction_city = st.text_input("Type City", "Mysuru", key="jurisdiction_other") if selected_city == OTHER_CITY else selected_city
     with c2:
-        client_name = st.text_input("Client Name", "Tech Solutions Pvt Ltd", help="Company Name or Individual Name")
-        gst_registered = st.checkbox("I am GST Registered", help="Check if you have a GSTIN")
-
-with tab2:
+        client_name = st.text_input("Client Name", "Tech Solutions Pvt Ltd", key="client_name", help="Company Name or Individual Name")
+        gst_registered = st.checkbox("I am GST Registered", key="gst_registered", help="Check if you have a GSTIN")
+    sync_live_preview()
+    return freelancer_name, jurisdiction_city, client_name, gst_registered
+
+@st.fragment
+def scope_tab():
+    count_partial_rerun()
     st.markdown('<div class="warning-box">⚠️ <b>NOTE:</b> Selecting a category adjusts the <b>Legal Clauses</b> (IP Rights, Warranty) to match your industry risks.</div>', unsafe_allow_html=True)
     template_choice = st.selectbox("✨ Select Industry (Smart Clauses):", list(scope_templates.keys()), key="template_selector", on_change=update_scope, help="This changes the contract text automatically.")
-    scope_work = st.text_area("Scope of Work (Annexure A)", key="scope_text", height=200, help="Be specific. Vague contracts lead to unpaid work.")
+    st.text_area("Scope of Work (Annexure A)", key="scope_text", height=200, help="Be specific. Vague contracts lead to unpaid work.")
+    sync_live_preview()
+    return template_choice
 
-with tab3:
+@st.fragment
+def money_tab():
+    count_partial_rerun()
     c1, c2, c3 = st.columns(3)
-    with c1: project_fee_num = st.number_input("Total Project Fee (INR)", value=50000, step=1000, help="Total contract value")
-    with c2: hourly_rate_num = st.number_input("Overtime Rate (INR/hr)", value=2000, step=500, help="Rate for Scope Creep")
+    with c1: project_fee_num = st.number_input("Total Project Fee (INR)", value=50000, step=1000, key="project_fee", help="Total contract value")
+    with c2: hourly_rate_num = st.number_input("Overtime Rate (INR/hr)", value=2000, step=500, key="hourly_rate", help="Rate for Scope Creep")
     with c3:
         st.write("Advance Required (%)")
         sc1, sc2 = st.columns([3, 1])
@@ -429,10 +447,34 @@ with tab3:
         with sc2: st.number_input("Num", 0, 100, key="num_key", on_change=update_from_num, label_visibility="collapsed")
         advance_percent = st.session_state.slider_key
     st.info(f"ℹ️ **Calculation:** You will receive **Rs. {int(project_fee_num * (advance_percent/100)):,}** before starting work.")
+    if st.checkbox("📈 Show the late-payment penalty in the contract", key="penalty_on", help="Adds a worked example of the MSME Act interest to the Payment Terms"):
+        pc1, pc2 = st.columns(2)
+        with pc1: st.number_input("RBI Bank Rate (%)", min_value=0.0, max_value=20.0, value=DEFAULT_BANK_RATE, step=0.25, key="bank_rate", help="Check rbi.org.in for the current Bank Rate")
+        with pc2: st.number_input("If paid this many days late", min_value=1, max_value=3650, value=90, step=15, key="days_late")
+        st.info(f"📈 **Projected penalty:** {penalty_paragraph(PaymentTerms(project_fee_num, advance_percent), *penalty_example_from_state())}")
+    sync_live_preview()
+    return project_fee_num, hourly_rate_num, advance_percent, penalty_example_from_state()
+
+with tab1:
+    freelancer_name, jurisdiction_city, client_name, gst_registered = parties_tab()
+
+with tab2:
+    template_choice = scope_tab()
+
+with tab3:
+    project_fee_num, hourly_rate_num, advance_percent, penalty_example = money_tab()
+
+# Re-renders only the sections an edit touches; the PDF and Word files are still built on download.
+# Off by default: with it on, every edit that changes the contract costs a full rerun.
+if st.toggle("👀 Live preview", value=False, key="live_preview_on", help="Update the contract text as you type"):
+    live_preview()
 
 st.markdown("---")
 
 # --- CONSENT ---
+PDF_SIZE_OPTIONS = {"standard": "Standard (print quality)", "lightweight": "Lightweight (for WhatsApp & email)"}
+pdf_profile = st.radio("PDF size", list(PDF_SIZE_OPTIONS), format_func=PDF_SIZE_OPTIONS.get, key="pdf_profile", horizontal=True, help="Lightweight PDFs embed a smaller logo and are a fraction of the size")
+
 check_terms = st.checkbox("I agree to the Terms of Use & Privacy Policy. I understand this is a tool, not legal advice.")
 
 c_main = st.columns([1, 2, 1])
@@ -455,126 +497,31 @@ if generate_btn:
         st.error("⚠️ Scope of Work is empty!")
         st.stop()
 
-    with st.spinner("Drafting your watertight contract..."):
-        time.sleep(1.5)
-    
-    advance_amount = int(project_fee_num * (advance_percent/100))
-    balance_amount = project_fee_num - advance_amount
+    output_cache = get_output_cache()
+    cache_key = contract_key(freelancer_name, client_name, jurisdiction_city, project_fee_num, hourly_rate_num, advance_percent, gst_registered, template_choice, st.session_state.scope_text, penalty_example)
     
-    safe_cost = f"Rs. {project_fee_num:,}"
-    safe_rate = f"Rs. {hourly_rate_num:,}"
-    safe_scope = st.session_state.scope_text.replace("₹", "Rs. ")
-    gst_clause = "(Exclusive of GST)" if gst_registered else ""
-    smart = get_smart_clauses(template_choice, safe_rate)
-    cancel_clause = smart.get("cancellation", "Cancellation after work starts incurs a forfeiture of the Advance Payment.")
+    try:
+        job = get_render_worker().submit(cache_key, draft_contract, output_cache, cache_key, freelancer_name, client_name, jurisdiction_city, project_fee_num, hourly_rate_num, advance_percent, gst_registered, template_choice, st.session_state.scope_text, penalty_example, owner=cache_owner())
+    except Overloaded:
+        st.warning("⏳ Lots of freelancers are generating contracts right now. Please try again in a few seconds.")
+        st.stop()
     
-    full_text = f"""PROFESSIONAL SERVICE AGREEMENT
-
-Date: {datetime.date.today().strftime('%B %d, %Y')}
-
-BETWEEN: {freelancer_name} ("Provider")
-AND: {client_name} ("Client")
-
-===============================================================
-
-1. PAYMENT TERMS (MSME ACT COMPLIANCE)
-
-Total Fee: {safe_cost} {gst_clause}
-Advance: {advance_percent}% (Rs. {advance_amount:,})
-Balance: Rs. {balance_amount:,}
-
-Late payments attract compound interest at 3x the Bank Rate (Section 16, MSMED Act, 2006).
-
-===============================================================
-
-2. ACCEPTANCE & REVISIONS
-
-{smart['acceptance']}
-
-===============================================================
-
-3. IP RIGHTS
-
-{smart['ip_rights']}
-
-===============================================================
-
-4. WARRANTY
-
-{smart['warranty']}
-
-===============================================================
-
-5. CONFIDENTIALITY
-
-Strict confidentiality for 2 years post-termination.
-
-===============================================================
-
-6. ANTI-GHOSTING CLAUSE
-
-Provider responds within 1 business day. Client silence >14 days = Termination.
-
-===============================================================
-
-7. CANCELLATION
-
-{smart['cancellation']}
-
-===============================================================
-
-8. TERMINATION BY PROVIDER
-
-{smart['termination']}
-
-===============================================================
-
-9. FORCE MAJEURE
-
-Not liable for acts of God or internet failure.
-
-===============================================================
-
-10. LIMITATION OF LIABILITY
-
-Liability limited to Total Fee paid.
-
-===============================================================
-
-11. JURISDICTION
-
-Disputes subject to Arbitration in {jurisdiction_city}, India under Arbitration Act, 1996.
-
-===============================================================
-
-12. GST COMPLIANCE
-
-Client bears GST liability.
-
-===============================================================
-
-13. STAMP DUTY
-
-Client responsible for stamp duty as per Indian Stamp Act, 1899.
-
-===============================================================
-
-SIGNATURES
-
-PROVIDER:
-Signature: _____________________
-Name: {freelancer_name}
-Date: _____________________
-
-CLIENT:
-Signature: _____________________
-Name: {client_name}
-Date: _____________________
-"""
+    # Poll the worker so the progress bar reflects the real state of the job
+    if not job.done():
+        progress = st.progress(job.progress, text="Drafting your watertight contract...")
+        while not job.done():
+            progress.progress(job.progress, text=job.stage)
+            time.sleep(0.1)
+        progress.empty()
     
     try:
-        pdf_data = create_professional_pdf(full_text, safe_scope, freelancer_name, client_name)
-        docx_data = create_professional_docx(full_text, safe_scope, freelancer_name, client_name)
+        contract, preview_text = job.result()
+        
+        # Only render the format the user actually downloads; identical requests are served from the cache
+        pdf_key = f"{cache_key}:pdf:{pdf_profile}"
+        pdf_data = lazy_document(output_cache, pdf_key, lambda: create_professional_pdf(contract, profile=pdf_profile), cache_owner())
+        docx_key = f"{cache_key}:docx"
+        docx_data = lazy_document(output_cache, docx_key, lambda: create_professional_docx(contract), cache_owner())
         
         st.success("✅ Contract Generated Successfully!")
         
@@ -587,14 +534,24 @@ Date: _____________________
         </div>
         """, unsafe_allow_html=True)
         
+        # A download that isn't cached yet would be turned away while the queue is full
+        busy = get_render_worker().saturated()
+        if busy and not (output_cache.size_of(pdf_key) and output_cache.size_of(docx_key)):
+            st.warning("⏳ Lots of freelancers are generating contracts right now. Click Generate again in a few seconds to enable the downloads.")
+        
         col_d1, col_d2 = st.columns(2)
         with col_d1:
-            st.download_button("📄 Download PDF", data=pdf_data, file_name="Contract.pdf", mime="application/pdf", use_container_width=True)
+            # Exact size once this PDF has been rendered (by anyone); until then the layout's estimate
+            pages, estimated_size = estimate_pdf(contract, pdf_profile)
+            pdf_size = output_cache.size_of(pdf_key)
+            size_text = f"{pdf_size / 1024:,.0f} KB" if pdf_size else f"~{estimated_size / 1024:,.0f} KB"
+            pdf_label = f"📄 Download PDF ({pages} page{'s' if pages != 1 else ''}, {size_text})"
+            st.download_button(pdf_label, data=pdf_data, file_name="Contract.pdf", mime="application/pdf", on_click="ignore", disabled=busy and not pdf_size, use_container_width=True)
         with col_d2:
-            st.download_button("📝 Download Word", data=docx_data, file_name="Contract.docx", mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document", use_container_width=True)
+            st.download_button("📝 Download Word", data=docx_data, file_name="Contract.docx", mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document", on_click="ignore", disabled=busy and not output_cache.size_of(docx_key), use_container_width=True)
             
         with st.expander("👀 Preview Contract"):
-            st.text_area("", value=full_text + "\n\n" + "="*60 + "\nANNEXURE A\n" + "="*60 + "\n\n" + safe_scope, height=300)
+            st.text_area("", value=preview_text, height=300)
     
     except Exception as e:
         st.error(f"Error: {str(e)}")
@@ -605,4 +562,7 @@ st.markdown("""
     <p><b>© 2025 Freelance Shield Pro.</b> All rights reserved.</p>
     <p><b>Disclaimer:</b> This tool provides templates for informational purposes only.</p>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+# The page is already on its way to the browser; load the PDF/Word libraries while the user fills in the form
+prewarm_in_background()
\ No newline at end of file
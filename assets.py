@@ -0,0 +1,115 @@
+"""Process-wide cache for the image assets embedded in generated documents."""
+import os
+import tempfile
+import threading
+import time
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow ships with Streamlit, but the engine must still work without it
+    Image = None
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+LOGO_PATH = os.path.join(APP_DIR, "logo.png")
+
+# The PDF stamps the logo 25 mm wide; 300 dpi is print quality at that size.
+LOGO_WIDTH_MM = 25
+LOGO_DPI = 300
+# Lightweight PDFs embed the logo as a JPEG flattened onto the white page
+JPEG_QUALITY = 75
+
+# How often (seconds) to re-stat the source file for changes.
+MTIME_CHECK_INTERVAL = 2.0
+
+_lock = threading.Lock()
+_cache = {}
+
+def _downsample_png(path, width_px):
+    """Write a copy of `path` scaled down to `width_px` and return the temp file path."""
+    with Image.open(path) as im:
+        if im.width > width_px:
+            height_px = max(1, round(im.height * width_px / im.width))
+            im = im.resize((width_px, height_px), Image.LANCZOS)
+        if im.mode not in ("RGB", "RGBA", "L", "LA", "P"):
+            im = im.convert("RGBA")
+        fd, tmp_path = tempfile.mkstemp(suffix=".png")
+        with os.fdopen(fd, "wb") as f:
+            im.save(f, format="PNG", optimize=True)
+    return tmp_path
+
+def _downsample_jpeg(path, width_px, quality=JPEG_QUALITY):
+    """Like _downsample_png, but flattened onto white and saved as a baseline JPEG."""
+    with Image.open(path) as im:
+        if im.width > width_px:
+            height_px = max(1, round(im.height * width_px / im.width))
+            im = im.resize((width_px, height_px), Image.LANCZOS)
+        im = im.convert("RGBA")
+        flat = Image.new("RGB", im.size, (255, 255, 255))
+        flat.paste(im, mask=im.getchannel("A"))
+        fd, tmp_path = tempfile.mkstemp(suffix=".jpg")
+        with os.fdopen(fd, "wb") as f:
+            flat.save(f, format="JPEG", quality=quality, optimize=True)
+    return tmp_path
+
+def _parse_image(path, width_mm, dpi, fmt="png"):
+    """Decode the image once into FPDF's image-info dict (compressed data, soft mask, palette).
+
+    fmt "jpeg" re-encodes it as a JPEG instead; without Pillow the original PNG is used.
+    """
+    from fpdf import FPDF
+    width_px = round(width_mm / 25.4 * dpi)
+    if Image is None:
+        return FPDF()._parsepng(path)
+    if fmt == "jpeg":
+        tmp_path = _downsample_jpeg(path, width_px)
+        parse = FPDF()._parsejpg
+    else:
+        tmp_path = _downsample_png(path, width_px)
+        parse = FPDF()._parsepng
+    try:
+        return parse(tmp_path)
+    finally:
+        os.remove(tmp_path)
+
+def pdf_image_info(path=LOGO_PATH, width_mm=LOGO_WIDTH_MM, dpi=LOGO_DPI, fmt="png"):
+    """Return the cached FPDF image info for `path`, or None if the file is missing.
+
+    The image is downsampled to its printed size (and re-encoded if `fmt` is
+    "jpeg") and parsed on first use, then served from memory until the file's
+    mtime changes.
+    """
+    key = (path, width_mm, dpi, fmt)
+    now = time.monotonic()
+    entry = _cache.get(key)
+    if entry and now - entry["checked"] < MTIME_CHECK_INTERVAL:
+        return entry["info"]
+
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        _cache.pop(key, None)
+        return None
+    if entry and entry["mtime"] == mtime:
+        entry["checked"] = now
+        return entry["info"]
+
+    with _lock:
+        entry = _cache.get(key)
+        if not entry or entry["mtime"] != mtime:
+            entry = {"mtime": mtime, "info": _parse_image(path, width_mm, dpi, fmt), "checked": now}
+            _cache[key] = entry
+    return entry["info"]
+
+def place_cached_image(pdf, info, name, x, y, w):
+    """Draw a pre-parsed image without FPDF touching the file system.
+
+    FPDF deletes the image data from its info dict once the document is
+    written, so each document gets its own shallow copy of the cached entry.
+    The image was parsed on a throwaway FPDF, so the PDF 1.4 bump FPDF makes
+    for alpha channels has to be applied to the real document here.
+    """
+    if info.get("smask") and pdf.pdf_version < "1.4":
+        pdf.pdf_version = "1.4"
+    if name not in pdf.images:
+        pdf.images[name] = dict(info, i=len(pdf.images) + 1)
+    pdf.image(name, x, y, w)
@@ -0,0 +1,302 @@
+"""Headless batch contract generator.
+
+Reads one contract per row from a CSV or JSONL file and renders PDF/DOCX files
+with the same clause and renderer logic as the Streamlit app:
+
+    python batch_generate.py parties.csv --out contracts/
+    python batch_generate.py parties.jsonl --zip contracts.zip --formats pdf --workers 8
+
+Columns / keys: provider_name, client_name, jurisdiction, project_fee,
+hourly_rate, advance_percent, gst_registered, category, scope (optional, falls
+back to the category template) and id (optional, used as the file name).
+"""
+import argparse
+import concurrent.futures
+import csv
+import json
+import math
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+import contract_engine
+
+FORMATS = ("pdf", "docx")
+DEFAULTS = {
+    "jurisdiction": "Bengaluru, Karnataka",
+    "project_fee": 50000,
+    "hourly_rate": 2000,
+    "advance_percent": 50,
+    "gst_registered": False,
+}
+
+# --- INPUT ---
+def read_rows(path):
+    """Yield (line_number, row_dict) lazily so huge inputs never sit in memory.
+
+    A JSONL line that isn't valid JSON is yielded as a ValueError in place of
+    the row, so it is reported like any other bad row instead of ending the run.
+    """
+    if path.lower().endswith((".jsonl", ".ndjson")):
+        with open(path, encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        yield number, json.loads(line)
+                    except ValueError as e:
+                        yield number, ValueError(f"Invalid JSON: {e}")
+    else:
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            for number, row in enumerate(csv.DictReader(f), 2):
+                # Single-line CSV cells spell line breaks in the scope as a literal \n
+                if row.get("scope"):
+                    row["scope"] = row["scope"].replace("\\n", "\n")
+                yield number, row
+
+def resolve_category(name):
+    """Accept the exact template key or the label without its emoji, e.g. 'Web Development'."""
+    name = (name or "").strip()
+    if name in contract_engine.scope_templates and name != "Select a template...":
+        return name
+    for key in contract_engine.scope_templates:
+        if key.split(" ", 1)[-1].lower() == name.lower() and key != "Select a template...":
+            return key
+    raise ValueError(f"Unknown category: {name!r}")
+
+def _as_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "y")
+
+def _amount(data, field, maximum=math.inf):
+    """Whole-rupee (or whole-percent) value of `field`; rejects negative, infinite and NaN input."""
+    raw = data.get(field, DEFAULTS[field])
+    try:
+        value = float(raw)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be a number, got {raw!r}")
+    if not math.isfinite(value) or value < 0:
+        raise ValueError(f"{field} must be a non-negative number, got {raw!r}")
+    if value > maximum:
+        raise ValueError(f"{field} must be between 0 and {maximum}, got {raw!r}")
+    return int(value)
+
+def normalize_row(row):
+    if not isinstance(row, dict):
+        raise ValueError("Row must be an object of field names to values")
+    data = {k: v for k, v in row.items() if v not in (None, "")}
+    for field in ("provider_name", "client_name", "category"):
+        if not str(data.get(field, "")).strip():
+            raise ValueError(f"Missing required field: {field}")
+    category = resolve_category(data["category"])
+    scope = data.get("scope") or contract_engine.scope_templates[category]
+    return {
+        "id": str(data.get("id", "")).strip(),
+        "provider_name": str(data["provider_name"]).strip(),
+        "client_name": str(data["client_name"]).strip(),
+        "jurisdiction": str(data.get("jurisdiction", DEFAULTS["jurisdiction"])).strip(),
+        "project_fee": _amount(data, "project_fee"),
+        "hourly_rate": _amount(data, "hourly_rate"),
+        # Same 0-100 range as the app's advance slider
+        "advance_percent": _amount(data, "advance_percent", 100),
+        "gst_registered": _as_bool(data.get("gst_registered", DEFAULTS["gst_registered"])),
+        "category": category,
+        "scope": scope,
+    }
+
+def output_stem(number, row):
+    base = row["id"] or f"{number:06d}_{row['client_name']}"
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", base).strip("_") or f"{number:06d}"
+
+# --- WORKER ---
+def _init_worker():
+    # Import the renderers and pay first-render costs once per process, not per row.
+    contract_engine.warm_up()
+
+def _render_to_file(staging_dir, write):
+    """Run `write(fileobj)` into a new file in `staging_dir`; returns (path, size)."""
+    fd, path = tempfile.mkstemp(suffix=".part", dir=staging_dir)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        return path, os.path.getsize(path)
+    except BaseException:
+        os.remove(path)
+        raise
+
+def render_row(number, row, formats, staging_dir, docx_backend=None, pdf_profile=None):
+    """Render one row straight to files in `staging_dir`; returns (name, path, size) triples.
+
+    Documents are streamed to disk page by page rather than passed back to
+    the parent process as bytes, so even huge annexures never sit in memory.
+    """
+    contract = contract_engine.build_contract(
+        row["provider_name"], row["client_name"], row["jurisdiction"], row["project_fee"],
+        row["hourly_rate"], row["advance_percent"], row["gst_registered"], row["category"], row["scope"],
+    )
+    stem = output_stem(number, row)
+    files = []
+    try:
+        if "pdf" in formats:
+            path, size = _render_to_file(staging_dir, lambda f: contract_engine.write_professional_pdf(contract, f, profile=pdf_profile))
+            files.append((f"{stem}.pdf", path, size))
+        if "docx" in formats:
+            path, size = _render_to_file(staging_dir, lambda f: contract_engine.write_professional_docx(contract, f, docx_backend))
+            files.append((f"{stem}.docx", path, size))
+    except BaseException:
+        for _, path, _ in files:
+            os.remove(path)
+        raise
+    return files
+
+# --- OUTPUT ---
+# Workers render into `staging_dir`; add() then moves each finished file into place.
+class DirectorySink:
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        # Same file system as the output, so add() is a rename
+        self.staging_dir = path
+
+    def add(self, name, staged_path):
+        os.replace(staged_path, os.path.join(self.path, name))
+
+    def close(self):
+        pass
+
+class ZipSink:
+    def __init__(self, path):
+        # PDFs and DOCX files are already compressed, so store them as-is.
+        self.archive = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED)
+        self.staging_dir = tempfile.mkdtemp(prefix=".batch-", dir=os.path.dirname(os.path.abspath(path)))
+
+    def add(self, name, staged_path):
+        # ZipFile.write() copies in chunks, so large documents are never read whole
+        self.archive.write(staged_path, name)
+        os.remove(staged_path)
+
+    def close(self):
+        self.archive.close()
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+
+# --- DRIVER ---
+def _remove_staged(results):
+    """Delete staged files that were never handed to the sink."""
+    for _, path, _ in results:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def run_batch(input_path, sink, formats=FORMATS, workers=None, window=None, docx_backend=None, pdf_profile=None, progress_every=500, log=sys.stderr):
+    """Render every row through a process pool, writing files as soon as each row finishes.
+
+    Only `window` rows are in flight at a time, so memory stays bounded no
+    matter how long the input is. Returns a summary dict.
+    """
+    workers = workers or os.cpu_count() or 1
+    window = window or workers * 4
+    started = time.perf_counter()
+    done = files = total_bytes = 0
+    errors = []
+    pending = {}
+
+    def collect(future):
+        nonlocal done, files, total_bytes
+        number = pending.pop(future)
+        try:
+            results = future.result()
+        except Exception as e:
+            errors.append((number, str(e)))
+            return
+        for index, (name, path, size) in enumerate(results):
+            try:
+                sink.add(name, path)
+            except BaseException:
+                _remove_staged(results[index:])
+                raise
+            files += 1
+            total_bytes += size
+        done += 1
+        if progress_every and done % progress_every == 0:
+            elapsed = time.perf_counter() - started
+            print(f"{done} contracts in {elapsed:.1f}s ({done / elapsed:.1f}/s)", file=log)
+
+    pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+    try:
+        for number, raw in read_rows(input_path):
+            try:
+                if isinstance(raw, ValueError):
+                    raise raw
+                row = normalize_row(raw)
+            except (ValueError, TypeError, OverflowError) as e:
+                errors.append((number, str(e)))
+                continue
+            pending[pool.submit(render_row, number, row, formats, sink.staging_dir, docx_backend, pdf_profile)] = number
+            if len(pending) >= window:
+                finished, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in finished:
+                    collect(future)
+        for future in concurrent.futures.as_completed(list(pending)):
+            collect(future)
+    except BaseException:
+        # Drop the rows not started yet, wait for the running ones and delete
+        # everything they staged, so an aborted run leaves no *.part files behind
+        pool.shutdown(wait=True, cancel_futures=True)
+        for future in pending:
+            if not future.cancelled() and future.exception() is None:
+                _remove_staged(future.result())
+        raise
+    pool.shutdown()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "contracts": done,
+        "files": files,
+        "bytes": total_bytes,
+        "errors": errors,
+        "seconds": elapsed,
+        "contracts_per_second": done / elapsed if elapsed else 0.0,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate Freelance Shield contracts in bulk from a CSV or JSONL file.")
+    parser.add_argument("input", help="CSV or JSONL file, one contract per row")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out", help="directory to write contracts into")
+    target.add_argument("--zip", help="write all contracts into a single ZIP archive")
+    parser.add_argument("--formats", default="pdf,docx", help="comma-separated: pdf, docx (default: both)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--docx-backend", choices=contract_engine.DOCX_BACKENDS, default=None, help="DOCX renderer (default: $FREELANCE_SHIELD_DOCX_BACKEND or python-docx)")
+    parser.add_argument("--pdf-profile", choices=list(contract_engine.PDF_PROFILES), default=None, help="PDF output profile (default: $FREELANCE_SHIELD_PDF_PROFILE or standard)")
+    parser.add_argument("--window", type=int, default=None, help="max rows in flight (default: 4 x workers)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isfile(args.input):
+        parser.error(f"input file not found: {args.input}")
+    formats = tuple(f.strip().lower() for f in args.formats.split(",") if f.strip())
+    unknown = set(formats) - set(FORMATS)
+    if not formats or unknown:
+        parser.error(f"--formats must be drawn from {', '.join(FORMATS)}")
+
+    sink = ZipSink(args.zip) if args.zip else DirectorySink(args.out)
+    try:
+        summary = run_batch(args.input, sink, formats, args.workers, args.window, args.docx_backend, args.pdf_profile)
+    finally:
+        sink.close()
+
+    for number, message in summary["errors"]:
+        print(f"line {number}: {message}", file=sys.stderr)
+    print(
+        f"{summary['contracts']} contracts, {summary['files']} files, "
+        f"{summary['bytes'] / 1_048_576:.1f} MB in {summary['seconds']:.1f}s "
+        f"({summary['contracts_per_second']:.1f} contracts/s, {len(summary['errors'])} errors)"
+    )
+    return 1 if summary["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
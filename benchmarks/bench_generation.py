@@ -0,0 +1,181 @@
+"""Micro and end-to-end benchmarks for contract generation (no Streamlit needed).
+
+    python benchmarks/bench_generation.py                       # run, print, save results
+    python benchmarks/bench_generation.py --quick               # annexures up to 1,000 lines
+    python benchmarks/bench_generation.py --save-baseline       # also store as the baseline
+    python benchmarks/bench_generation.py --baseline old.json --fail-over 15
+
+Results are written as JSON (see --output) and compared case by case against
+the baseline, so a slower change shows up as a ratio rather than a feeling.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import contract_engine  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+BASELINE_PATH = os.path.join(RESULTS_DIR, "baseline.json")
+ANNEXURE_SIZES = (10, 100, 1000, 10000)
+QUICK_ANNEXURE_SIZES = (10, 100, 1000)
+
+# Each case runs for at least MIN_SECONDS (and at least MIN_REPEATS times), capped at MAX_REPEATS
+MIN_SECONDS = 0.5
+MIN_REPEATS = 3
+MAX_REPEATS = 200
+
+SAMPLE_TEXTS = {
+    "ascii": "Web development services including responsive design, API integration and deployment. " * 4,
+    "typographic": "The Client’s “final” approval — within 7 days… • Rs. ₹50,000 ═══ " * 4,
+    "devanagari": "प्रदाता: अमित कुमार — ग्राहक: टेक सॉल्यूशंस प्राइवेट लिमिटेड " * 4,
+}
+
+# --- CASES ---
+def synthetic_annexure(lines):
+    """Scope of Work with `lines` numbered deliverables of realistic length."""
+    return "\n".join(
+        f"{number}. Deliverable {number}: design, build and test module {number} as described in the project brief."
+        for number in range(1, lines + 1)
+    )
+
+def contract_for(category, scope):
+    return contract_engine.build_contract(
+        "Amit Kumar", "Tech Solutions Pvt Ltd", "Bengaluru, Karnataka",
+        50000, 2000, 50, True, category, scope, date=datetime.date(2025, 1, 1),
+    )
+
+def benchmark_cases(annexure_sizes):
+    """Yield (name, callable) pairs; names are stable so results can be compared across runs."""
+    categories = [name for name in contract_engine.scope_templates if name != "Select a template..."]
+    for label, text in SAMPLE_TEXTS.items():
+        yield f"clean_text_for_pdf/{label}", lambda text=text: contract_engine.clean_text_for_pdf(text)
+    for category in categories:
+        slug = category.split(" ", 1)[-1].replace("/", "-")
+        scope = contract_engine.scope_templates[category]
+        contract = contract_for(category, scope)
+        yield f"get_smart_clauses/{slug}", lambda category=category: contract_engine.get_smart_clauses(category, "Rs. 2,000")
+        yield f"full_text/{slug}", lambda category=category, scope=scope: contract_for(category, scope).preview_text()
+        yield f"pdf/{slug}", lambda contract=contract: contract_engine.create_professional_pdf(contract)
+        for backend in contract_engine.DOCX_BACKENDS:
+            yield f"docx-{backend}/{slug}", lambda contract=contract, backend=backend: contract_engine.create_professional_docx(contract, backend=backend)
+    category = categories[0]
+    for lines in annexure_sizes:
+        scope = synthetic_annexure(lines)
+        contract = contract_for(category, scope)
+        yield f"pdf/annexure-{lines}", lambda contract=contract: contract_engine.create_professional_pdf(contract)
+        yield f"pdf_estimate/annexure-{lines}", lambda contract=contract: contract_engine.estimate_pdf(contract)
+        for backend in contract_engine.DOCX_BACKENDS:
+            yield f"docx-{backend}/annexure-{lines}", lambda contract=contract, backend=backend: contract_engine.create_professional_docx(contract, backend=backend)
+            yield f"end_to_end-{backend}/annexure-{lines}", lambda scope=scope, backend=backend: end_to_end(category, scope, backend)
+
+def end_to_end(category, scope, backend):
+    """What one Generate click plus both downloads costs: contract, preview, PDF and DOCX."""
+    contract = contract_for(category, scope)
+    contract.preview_text()
+    contract_engine.create_professional_pdf(contract)
+    contract_engine.create_professional_docx(contract, backend=backend)
+
+# --- RUNNER ---
+def measure(fn):
+    fn()  # warm-up: first-call caches (logo, fonts, DOCX skeleton) are not what we are timing
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < MAX_REPEATS and (len(timings) < MIN_REPEATS or time.perf_counter() - started < MIN_SECONDS):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return {
+        "repeats": len(timings),
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(annexure_sizes, pattern=None):
+    results = {}
+    for name, fn in benchmark_cases(annexure_sizes):
+        if pattern and pattern not in name:
+            continue
+        results[name] = measure(fn)
+        print(f"{name:45} {results[name]['median'] * 1000:10.3f} ms  (x{results[name]['repeats']})", flush=True)
+    return {
+        "meta": {
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "docx_backends": list(contract_engine.DOCX_BACKENDS),
+        },
+        "results": results,
+    }
+
+def slower_than(current, baseline, percent):
+    """Names of the cases whose median is more than `percent` percent above the baseline."""
+    return [
+        name for name, result in current["results"].items()
+        if name in baseline["results"] and result["median"] > baseline["results"][name]["median"] * (1 + percent / 100)
+    ]
+
+def compare(current, baseline, threshold):
+    """Print median ratios against `baseline` and flag changes beyond `threshold` percent."""
+    print(f"\nCompared with baseline {baseline['meta'].get('revision') or ''} ({baseline['meta'].get('created', '?')}):")
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:45} {'new':>10}")
+            continue
+        ratio = result["median"] / before["median"] if before["median"] else float("inf")
+        change = (ratio - 1) * 100
+        flag = "  REGRESSION" if change > threshold else "  faster" if change < -threshold else ""
+        print(f"{name:45} {ratio:9.2f}x {change:+8.1f}%{flag}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark contract generation.")
+    parser.add_argument("--quick", action="store_true", help=f"annexures up to {QUICK_ANNEXURE_SIZES[-1]:,} lines only")
+    parser.add_argument("-k", dest="pattern", help="only run cases whose name contains this text")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="results file to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="also write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent change reported as faster/regression (default: 10)")
+    parser.add_argument("--fail-over", type=float, default=None, help="exit 1 if any case is this many percent slower than the baseline")
+    args = parser.parse_args(argv)
+
+    current = run(QUICK_ANNEXURE_SIZES if args.quick else ANNEXURE_SIZES, args.pattern)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(RESULTS_DIR, datetime.datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    status = 0
+    if os.path.isfile(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        compare(current, baseline, args.threshold)
+        if args.fail_over is not None and slower_than(current, baseline, args.fail_over):
+            status = 1
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,377 @@
+"""Concurrent-session load test for app.py against a real local Streamlit server.
+
+    python benchmarks/load_test.py                          # 10 sessions, 2 passes each
+    python benchmarks/load_test.py --sessions 50 --ramp 0.2 --iterations 3
+    python benchmarks/load_test.py --sessions 20 --json     # machine-readable report
+    python benchmarks/load_test.py --url http://127.0.0.1:8501   # a server that's already running
+    python benchmarks/load_test.py --no-live-preview        # sessions that leave the preview off
+
+By default the harness starts `streamlit run app.py` on a free port. Each
+simulated session then opens its own websocket, the same way a browser tab
+does, so all sessions share one server process with its caches, render
+worker and script threads. A session loads the page, fills in the three tabs,
+ticks the consent box and clicks Generate. Tab edits are sent as fragment
+reruns, as the browser would send them. Sessions switch the live preview on
+first, the heavier case: an edit that changes the contract then costs the
+tab's partial rerun plus the full rerun that redraws the preview, and both
+are part of that step's time. Every interaction is timed from the request
+until the server reports the last script run finished. The report gives
+p50/p95/p99 latency per step, reruns and contracts per second, and the
+server's resident memory before, at peak and after.
+
+AppTest can't be used for this: it runs the script in the test process and
+swaps Streamlit's global runtime, so concurrent AppTests break each other.
+The clients don't click the download buttons; the renderers behind them are
+covered by bench_generation.py.
+
+Needs websockets 13 or later for its asyncio client (`pip install -r
+benchmarks/requirements.txt`); older Streamlit releases pin an earlier version.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+try:
+    from websockets.asyncio.client import connect
+except ImportError:
+    sys.exit("load_test.py needs websockets 13 or later: pip install -r benchmarks/requirements.txt")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+TEMPLATE = "💻 Web Development"
+CONSENT_LABEL = "I agree to the Terms of Use & Privacy Policy. I understand this is a tool, not legal advice."
+GENERATE_LABEL = "🚀 Generate Legal Contract Now"
+SUCCESS_TEXT = "Contract Generated Successfully"
+# Seconds a single rerun may take before the session gives up on it
+RERUN_TIMEOUT = 120
+# Seconds to wait for a freshly started server to answer its health check
+STARTUP_TIMEOUT = 60
+
+# --- MEMORY ---
+def rss_bytes(pid="self"):
+    """Current resident set size of a process from Linux /proc; None where that isn't available."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+class RSSSampler(threading.Thread):
+    """Samples a process's RSS in the background so the peak between start and stop is known."""
+
+    def __init__(self, pid, interval=0.1):
+        super().__init__(name="rss-sampler", daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak = rss_bytes(pid)
+        self._stop_event = threading.Event()
+
+    def _sample(self):
+        value = rss_bytes(self.pid)
+        if value is not None:
+            self.peak = max(self.peak or 0, value)
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self._sample()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self._sample()
+
+# --- SERVER ---
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def wait_healthy(url, timeout=STARTUP_TIMEOUT, process=None):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"streamlit exited with status {process.returncode} before it was ready")
+        try:
+            with urllib.request.urlopen(url + "/_stcore/health", timeout=2) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"{url} did not become healthy within {timeout}s")
+
+def start_server(port):
+    """`streamlit run app.py` on 127.0.0.1:`port`; returns (process, base_url) once it answers."""
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", APP_PATH,
+            "--server.headless", "true",
+            "--server.address", "127.0.0.1",
+            "--server.port", str(port),
+            "--server.fileWatcherType", "none",
+            "--browser.gatherUsageStats", "false",
+            "--logger.level", "error",
+        ],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        wait_healthy(url, process=process)
+    except Exception:
+        process.kill()
+        process.wait()
+        raise
+    return process, url
+
+# --- SESSIONS ---
+class Session:
+    """One browser tab: a websocket plus the widget state the frontend would hold."""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        # key or label -> (widget id, fragment id or "")
+        self.widgets = {}
+        self.states = {}
+        self.alerts = []
+        # Script runs the server finished for this session, including preview redraws
+        self.reruns = 0
+
+    async def rerun(self, fragment_id="", trigger=None):
+        """Send one rerun request and read the server's messages until the script finishes.
+
+        A run that ends early for a rerun it requested (the live preview's
+        redraw) is followed by that rerun, so reading goes on until it is done.
+        """
+        message = BackMsg()
+        client_state = message.rerun_script
+        client_state.widget_states.widgets.extend(self.states.values())
+        client_state.fragment_id = fragment_id
+        if trigger is not None:
+            # Buttons are one-shot: the click is sent with this rerun only
+            client_state.widget_states.widgets.add(id=trigger, trigger_value=True)
+        self.alerts = []
+        await self.websocket.send(message.SerializeToString())
+        while True:
+            msg = ForwardMsg()
+            msg.ParseFromString(await self.websocket.recv())
+            kind = msg.WhichOneof("type")
+            if kind == "delta":
+                self._read_delta(msg.delta)
+            elif kind == "script_finished":
+                if msg.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    raise RuntimeError("app.py failed to compile")
+                self.reruns += 1
+                if msg.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return
+
+    def _read_delta(self, delta):
+        if delta.WhichOneof("type") != "new_element":
+            return
+        element = getattr(delta.new_element, delta.new_element.WhichOneof("type"))
+        if delta.new_element.HasField("exception"):
+            raise RuntimeError(element.message)
+        if delta.new_element.HasField("alert"):
+            self.alerts.append(element.body)
+        widget_id = getattr(element, "id", "")
+        if widget_id:
+            user_key = widget_id.split("-", 2)[-1]
+            name = user_key if user_key != "None" else element.label
+            self.widgets[name] = (widget_id, delta.fragment_id)
+
+    async def set(self, name, **value):
+        """Change a widget by key (or label, for unkeyed ones) and rerun, as the frontend does."""
+        widget_id, fragment_id = self.widgets[name]
+        self.states[widget_id] = WidgetState(id=widget_id, **value)
+        await self.rerun(fragment_id)
+
+    async def click(self, name):
+        widget_id, fragment_id = self.widgets[name]
+        await self.rerun(fragment_id, trigger=widget_id)
+
+def session_steps(number, iteration, live_preview=True):
+    """(step, action) pairs for one pass through the form; actions take a Session and return a coroutine."""
+    preview = [("preview", lambda s: s.set("live_preview_on", bool_value=True))] if live_preview and iteration == 0 else []
+    return preview + [
+        ("edit", lambda s: s.set("provider_name", string_value=f"Provider {number}-{iteration}")),
+        ("edit", lambda s: s.set("client_name", string_value=f"Client {number} Pvt Ltd")),
+        ("edit", lambda s: s.set("template_selector", string_value=TEMPLATE)),
+        ("edit", lambda s: s.set("project_fee", double_value=40000 + 1000 * (number % 20) + iteration)),
+        ("edit", lambda s: s.set("hourly_rate", double_value=1500 + 100 * (number % 10))),
+        ("consent", lambda s: s.set(CONSENT_LABEL, bool_value=True)),
+        ("generate", lambda s: s.click(GENERATE_LABEL)),
+    ]
+
+async def timed_rerun(session, action, step, record):
+    started = time.perf_counter()
+    runs = session.reruns
+    await asyncio.wait_for(action, RERUN_TIMEOUT)
+    record(step, time.perf_counter() - started, session.reruns - runs)
+
+async def run_session(url, number, iterations, record, errors, live_preview=True):
+    """One simulated user: load the page, then fill in and generate `iterations` times."""
+    try:
+        async with connect(url.replace("http", "ws", 1) + "/_stcore/stream", subprotocols=["streamlit"], max_size=None) as websocket:
+            session = Session(websocket)
+            await timed_rerun(session, session.rerun(), "load", record)
+            for iteration in range(iterations):
+                for step, action in session_steps(number, iteration, live_preview):
+                    await timed_rerun(session, action(session), step, record)
+                if not any(SUCCESS_TEXT in body for body in session.alerts):
+                    raise RuntimeError("Generate did not produce a contract" + (f": {session.alerts[-1]}" if session.alerts else ""))
+    except Exception as e:
+        errors.append((number, repr(e)))
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    return statistics.quantiles(sorted_values, n=100, method="inclusive")[q - 1]
+
+def summarize(latencies):
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "mean": statistics.fmean(values) if values else None,
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": values[-1] if values else None,
+    }
+
+async def _run_sessions(url, sessions, iterations, ramp, record, errors, live_preview):
+    tasks = []
+    for number in range(sessions):
+        tasks.append(asyncio.create_task(run_session(url, number, iterations, record, errors, live_preview)))
+        await asyncio.sleep(ramp)
+    await asyncio.gather(*tasks)
+
+def run_load(url, sessions, iterations, ramp, pid=None, live_preview=True):
+    """Run `sessions` sessions started `ramp` seconds apart against `url` and return the report dict.
+
+    `pid` is the server process to measure; RSS is left out without it.
+    """
+    latencies = {}
+    errors = []
+    script_runs = 0
+
+    def record(step, seconds, runs):
+        nonlocal script_runs
+        latencies.setdefault(step, []).append(seconds)
+        script_runs += runs
+
+    # Warm the server's process-wide caches first, as a running deployment would have them
+    warm_errors = []
+    asyncio.run(run_session(url, -1, 1, lambda step, seconds, runs: None, warm_errors, live_preview))
+    if warm_errors:
+        raise RuntimeError(f"warm-up session failed: {warm_errors[0][1]}")
+    rss_before = rss_bytes(pid) if pid else None
+    sampler = RSSSampler(pid) if pid else None
+    if sampler:
+        sampler.start()
+
+    started = time.perf_counter()
+    asyncio.run(_run_sessions(url, sessions, iterations, ramp, record, errors, live_preview))
+    elapsed = time.perf_counter() - started
+    if sampler:
+        sampler.stop()
+    rss_after = rss_bytes(pid) if pid else None
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    generated = len(latencies.get("generate", ())) - len(errors)
+    return {
+        "meta": {
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "url": url,
+            "sessions": sessions,
+            "iterations": iterations,
+            "ramp_seconds": ramp,
+            "live_preview": live_preview,
+            "cpus": os.cpu_count(),
+            "render_workers": os.environ.get("FREELANCE_SHIELD_RENDER_WORKERS", "2"),
+        },
+        "seconds": elapsed,
+        "steps": len(all_latencies),
+        "reruns": script_runs,
+        "reruns_per_second": script_runs / elapsed,
+        "contracts_per_second": max(generated, 0) / elapsed,
+        "latency": {"all": summarize(all_latencies), **{step: summarize(values) for step, values in sorted(latencies.items())}},
+        "rss": {
+            "before": rss_before,
+            "peak": sampler.peak if sampler else None,
+            "after": rss_after,
+            "growth_per_session": (rss_after - rss_before) / sessions if rss_before and rss_after else None,
+        },
+        "errors": errors,
+    }
+
+def print_report(report):
+    meta = report["meta"]
+    print(f"{meta['sessions']} sessions x {meta['iterations']} passes, live preview {'on' if meta['live_preview'] else 'off'}, in {report['seconds']:.1f}s "
+          f"({report['reruns_per_second']:.1f} reruns/s, {report['contracts_per_second']:.2f} contracts/s)")
+    print(f"\n{'step':10} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for step, stats in report["latency"].items():
+        if stats["count"]:
+            print(f"{step:10} {stats['count']:6} {stats['p50'] * 1000:9.1f} {stats['p95'] * 1000:9.1f} {stats['p99'] * 1000:9.1f} {stats['max'] * 1000:9.1f}")
+    rss = report["rss"]
+    mb = 1024 * 1024
+    if rss["growth_per_session"] is not None:
+        print(f"\nServer RSS: {rss['before'] / mb:.0f} MB before, {rss['peak'] / mb:.0f} MB peak, {rss['after'] / mb:.0f} MB after "
+              f"({rss['growth_per_session'] / mb:+.2f} MB per session)")
+    for number, message in report["errors"]:
+        print(f"session {number}: {message}", file=sys.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test app.py with concurrent websocket sessions.")
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent simulated users (default: 10)")
+    parser.add_argument("--iterations", type=int, default=2, help="form fill + Generate passes per session (default: 2)")
+    parser.add_argument("--ramp", type=float, default=0.05, help="seconds between session starts (default: 0.05)")
+    parser.add_argument("--url", help="test a server that is already running instead of starting one (RSS is not reported)")
+    parser.add_argument("--no-live-preview", dest="live_preview", action="store_false", help="leave the live preview off, as a fresh tab has it")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--output", help="also write the JSON report here (default: benchmarks/results/load-<timestamp>.json)")
+    args = parser.parse_args(argv)
+
+    process = None
+    if args.url:
+        url = args.url.rstrip("/")
+        wait_healthy(url)
+    else:
+        process, url = start_server(free_port())
+    try:
+        report = run_load(url, args.sessions, args.iterations, args.ramp, process.pid if process else None, args.live_preview)
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(RESULTS_DIR, datetime.datetime.now().strftime("load-%Y%m%d-%H%M%S") + ".json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+        print(f"\nReport written to {output}")
+    return 1 if report["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
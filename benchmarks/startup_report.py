@@ -0,0 +1,92 @@
+"""Break down what a cold start of the app spends on imports.
+
+    python benchmarks/startup_report.py            # table of import cost by package
+    python benchmarks/startup_report.py --json     # same data, machine-readable
+
+Each measurement runs in a fresh interpreter with `python -X importtime`:
+
+* "first paint": the modules app.py imports at the top, i.e. what every cold
+  start pays before the page can be drawn;
+* "first render": what warm_up() loads on top of that (fpdf, python-docx,
+  fonts, the logo), which the app defers to a background thread.
+"""
+import argparse
+import ast
+import collections
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+
+def app_imports(path=APP_PATH):
+    """Top-level modules imported by app.py, in source order."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+def _importtime(code):
+    """Run `code` in a fresh interpreter; return ({module: self_us}, wall seconds) parsed from -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(self_us)
+    return modules, float(result.stdout.strip().splitlines()[-1])
+
+def _by_package(modules):
+    totals = collections.Counter()
+    for name, self_us in modules.items():
+        totals[name.split(".")[0]] += self_us
+    return totals
+
+def measure():
+    imports = app_imports()
+    timer = "import time; t = time.perf_counter(); {body}; print(time.perf_counter() - t)"
+    paint_modules, paint_seconds = _importtime(timer.format(body="; ".join(f"import {name}" for name in imports)))
+    render_body = "; ".join(f"import {name}" for name in imports) + "; t = time.perf_counter(); import contract_engine; contract_engine.warm_up()"
+    render_modules, render_seconds = _importtime(timer.format(body=render_body))
+    deferred = {name: us for name, us in render_modules.items() if name not in paint_modules}
+    return {
+        "app_imports": imports,
+        "first_paint": {"seconds": paint_seconds, "packages": dict(_by_package(paint_modules).most_common())},
+        "first_render": {"seconds": render_seconds, "packages": dict(_by_package(deferred).most_common())},
+    }
+
+def print_report(report, top=15):
+    for phase, title in (("first_paint", "Imports before first paint"), ("first_render", "Deferred to first render / background pre-warm")):
+        data = report[phase]
+        print(f"\n{title}: {data['seconds'] * 1000:.0f} ms wall")
+        for package, us in list(data["packages"].items())[:top]:
+            print(f"  {package:30} {us / 1000:8.1f} ms")
+    loaded_early = [name for name in ("fpdf", "docx") if name in report["first_paint"]["packages"]]
+    if loaded_early:
+        print(f"\nWARNING: {', '.join(loaded_early)} imported before first paint")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report the import cost of an app cold start.")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--top", type=int, default=15, help="packages to list per phase (default: 15)")
+    args = parser.parse_args(argv)
+    report = measure()
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, args.top)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
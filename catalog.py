@@ -0,0 +1,180 @@
+"""Scope templates and clause rules, loaded from catalog.json.
+
+The file is parsed and validated once into an immutable Catalog that every
+session shares. current_catalog() re-stats the file at most every couple of
+seconds and re-parses it only when its contents change, so wording edits go
+live without a restart. A broken edit is logged and the last good catalog
+stays in service.
+
+catalog.json layout (version 1):
+
+    {
+      "version": 1,
+      "templates": [{"category": "...", "scope": "..."}, ...],
+      "default_clauses": {"acceptance": "...", "warranty": "...", ...},
+      "clause_rules": [{"categories": ["..."], "overrides": {"warranty": "..."}}, ...]
+    }
+
+Clause text may use the {rate} placeholder (the overtime rate).
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from types import MappingProxyType
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+CATALOG_PATH = os.environ.get("FREELANCE_SHIELD_CATALOG", os.path.join(APP_DIR, "catalog.json"))
+SCHEMA_VERSION = 1
+# First entry of the template picker; not a real category
+PLACEHOLDER = "Select a template..."
+# Smart clauses the contract builder fills in; default_clauses must define exactly these
+CLAUSE_KEYS = ("acceptance", "warranty", "ip_rights", "cancellation", "termination")
+
+# How often (seconds) to re-stat the file for changes
+MTIME_CHECK_INTERVAL = 2.0
+
+class Catalog:
+    """Validated, read-only view of one catalog.json revision."""
+
+    __slots__ = ("version", "digest", "templates", "clause_table", "default_clauses")
+
+    def __init__(self, version, digest, templates, clause_table, default_clauses):
+        self.version = version
+        # sha256 of the file; changes whenever any wording does
+        self.digest = digest
+        self.templates = MappingProxyType(templates)
+        self.clause_table = MappingProxyType(clause_table)
+        self.default_clauses = default_clauses
+
+    def clauses(self, category, rate):
+        return {key: rate.join(parts) for key, parts in self.clause_table.get(category, self.default_clauses)}
+
+def _split_template(key, template):
+    if not template.strip():
+        # Renderers expect every clause paragraph to have text (python-docx styles its first run)
+        raise ValueError(f"Clause {key!r} is empty")
+    parts = tuple(template.split("{rate}"))
+    for part in parts:
+        if "{" in part or "}" in part:
+            raise ValueError(f"Clause {key!r} uses a placeholder other than {{rate}}: {template!r}")
+    return parts
+
+def compile_clause_rules(defaults, rules, categories):
+    """Validate the clause rules and flatten them into {category: ((key, parts), ...)}.
+
+    Returns (table, default_row). Unknown categories or clause keys, stray
+    placeholders and two rules overriding the same clause for one category
+    all raise ValueError here, at load time, rather than at request time.
+    """
+    default_row = {key: _split_template(key, text) for key, text in defaults.items()}
+    rows = {}
+    owners = {}
+    for index, (rule_categories, overrides) in enumerate(rules):
+        for key in overrides:
+            if key not in defaults:
+                raise ValueError(f"Rule {index} overrides unknown clause {key!r}")
+        for category in rule_categories:
+            if category not in categories:
+                raise ValueError(f"Rule {index} targets unknown category {category!r}")
+            row = rows.setdefault(category, dict(default_row))
+            for key, text in overrides.items():
+                if (category, key) in owners:
+                    raise ValueError(
+                        f"Rules {owners[category, key]} and {index} both override {key!r} for {category!r}"
+                    )
+                owners[category, key] = index
+                row[key] = _split_template(key, text)
+    table = {category: tuple(row.items()) for category, row in rows.items()}
+    return table, tuple(default_row.items())
+
+def _strings(value, what):
+    if not isinstance(value, dict) or not all(isinstance(k, str) and isinstance(v, str) for k, v in value.items()):
+        raise ValueError(f"{what} must map names to text")
+    return value
+
+def parse_catalog(raw):
+    """Validate catalog.json bytes and build a Catalog; raises ValueError on any problem."""
+    try:
+        data = json.loads(raw)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"catalog is not valid JSON: {e}")
+    if not isinstance(data, dict):
+        raise ValueError("catalog must be a JSON object")
+    if data.get("version") != SCHEMA_VERSION:
+        raise ValueError(f"unsupported catalog version {data.get('version')!r}; expected {SCHEMA_VERSION}")
+
+    templates = {PLACEHOLDER: ""}
+    for index, entry in enumerate(data.get("templates") or ()):
+        if not isinstance(entry, dict) or not isinstance(entry.get("category"), str) or not isinstance(entry.get("scope"), str):
+            raise ValueError(f"template {index} needs a category and a scope")
+        if entry["category"] in templates:
+            raise ValueError(f"template {index} repeats category {entry['category']!r}")
+        templates[entry["category"]] = entry["scope"]
+    if len(templates) == 1:
+        raise ValueError("catalog has no templates")
+
+    defaults = _strings(data.get("default_clauses"), "default_clauses")
+    missing = [key for key in CLAUSE_KEYS if key not in defaults]
+    if missing:
+        raise ValueError(f"default_clauses is missing {', '.join(missing)}")
+    unknown = [key for key in defaults if key not in CLAUSE_KEYS]
+    if unknown:
+        raise ValueError(f"default_clauses has unknown clauses {', '.join(unknown)}")
+    rules = []
+    for index, rule in enumerate(data.get("clause_rules") or ()):
+        if not isinstance(rule, dict) or not isinstance(rule.get("categories"), list):
+            raise ValueError(f"clause rule {index} needs a list of categories")
+        rules.append((tuple(rule["categories"]), _strings(rule.get("overrides"), f"clause rule {index} overrides")))
+    table, default_row = compile_clause_rules(defaults, rules, templates)
+    return Catalog(SCHEMA_VERSION, hashlib.sha256(raw).hexdigest(), templates, table, default_row)
+
+def load_catalog(path=CATALOG_PATH):
+    with open(path, "rb") as f:
+        return parse_catalog(f.read())
+
+_lock = threading.Lock()
+_loaded = {}
+
+def current_catalog(path=CATALOG_PATH):
+    """The catalog for `path`, reloaded when the file's contents change.
+
+    Between checks this is a dict lookup and a clock read. A changed mtime
+    costs one read and hash; the file is only re-parsed if the hash differs.
+    """
+    now = time.monotonic()
+    entry = _loaded.get(path)
+    if entry and now - entry["checked"] < MTIME_CHECK_INTERVAL:
+        return entry["catalog"]
+
+    with _lock:
+        entry = _loaded.get(path)
+        if entry and now - entry["checked"] < MTIME_CHECK_INTERVAL:
+            return entry["catalog"]
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            if entry is None:
+                raise
+            logging.getLogger(__name__).error("Catalog %s is missing; keeping revision %s", path, entry["catalog"].digest[:12])
+            entry["checked"] = now
+            return entry["catalog"]
+        if entry and entry["mtime"] == mtime:
+            entry["checked"] = now
+            return entry["catalog"]
+
+        with open(path, "rb") as f:
+            raw = f.read()
+        catalog = entry["catalog"] if entry else None
+        if catalog is None or hashlib.sha256(raw).hexdigest() != catalog.digest:
+            try:
+                catalog = parse_catalog(raw)
+            except ValueError:
+                if entry is None:
+                    raise
+                # A half-saved or mistyped edit must not take the app down
+                logging.getLogger(__name__).exception("Catalog %s is invalid; keeping revision %s", path, catalog.digest[:12])
+        _loaded[path] = {"catalog": catalog, "mtime": mtime, "checked": now}
+        return catalog
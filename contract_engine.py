@@ -0,0 +1,543 @@
+"""Contract engine shared by the Streamlit UI and the headless tools.
+
+Everything in here is free of Streamlit so it can be imported from worker
+processes (see batch_generate.py).
+
+fpdf and python-docx are imported inside the renderers, not here: the app needs
+the templates and clause logic to paint its first page, and the document
+libraries only once someone generates a contract (see warm_up()).
+"""
+import datetime
+import functools
+import os
+import io
+import logging
+import tempfile
+import threading
+import time
+from collections.abc import Mapping
+
+from assets import LOGO_DPI, LOGO_PATH, pdf_image_info, place_cached_image
+from catalog import current_catalog
+from contract_model import ANNEXURE_TITLE, TITLE, ContractDocument, PaymentTerms, Section
+from docx_stream import write_docx
+from pdf_layout import BOTTOM_MARGIN, PageCounter, font_metrics, line_ops, paragraphs_ops
+from telemetry import SIZE_BUCKETS, TELEMETRY, increment, observe, timed
+
+# "python-docx" builds the full object tree; "stream" writes WordprocessingML straight into the zip
+DOCX_BACKENDS = ("python-docx", "stream")
+DOCX_BACKEND = os.environ.get("FREELANCE_SHIELD_DOCX_BACKEND", "python-docx")
+
+# Annexures longer than this are rendered through a spooled temporary file, so
+# memory stays flat however many pages the scope runs to
+STREAMING_ANNEXURE_LINES = 2000
+# Spooled output stays in RAM up to this size before moving to disk
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+# Annexure lines measured and wrapped per batch
+ANNEXURE_CHUNK_LINES = 200
+
+# PDF output profiles, heaviest first. Page streams are Flate-compressed in all
+# of them; they differ in the logo, which is most of a short contract's bytes.
+# "lightweight" is meant for WhatsApp and mobile data: the logo at screen
+# resolution as a JPEG. "minimal" leaves it out.
+PDF_PROFILES = {
+    "standard": {"logo_dpi": LOGO_DPI, "logo_format": "png"},
+    "lightweight": {"logo_dpi": 96, "logo_format": "jpeg"},
+    "minimal": {"logo_dpi": None, "logo_format": None},
+}
+PDF_PROFILE = os.environ.get("FREELANCE_SHIELD_PDF_PROFILE", "standard")
+
+# --- HELPER FUNCTIONS ---
+# Typography FPDF's core fonts can't draw; applied only to text that isn't pure ASCII
+_PDF_REPLACEMENTS = (
+    ('₹', 'Rs. '), ('—', '-'), ('–', '-'), ('…', '...'), ('•', '-'), ('═', '='),
+    ('\u201c', '"'), ('\u201d', '"'), ('\u2018', "'"), ('\u2019', "'"),
+)
+
+def _normalize_typography(text):
+    if text.isascii():
+        return text
+    for old, new in _PDF_REPLACEMENTS:
+        if old in text:
+            text = text.replace(old, new)
+    return text
+
+def clean_text_for_pdf(text):
+    """Remove all characters that can't be encoded in latin-1"""
+    text = _normalize_typography(text)
+    try:
+        text.encode('latin-1')
+        return text
+    except UnicodeEncodeError:
+        return text.encode('latin-1', 'replace').decode('latin-1')
+
+def clean_text_for_unicode_pdf(text):
+    """Normalize typography but keep non-Latin characters for an embedded TTF font"""
+    return _normalize_typography(text)
+
+# --- PDF RENDERER ---
+def _replay(pdf, ops):
+    for method, args in ops:
+        if callable(method):
+            method(pdf, *args)
+        else:
+            getattr(pdf, method)(*args)
+
+def _pdf_body_ops(line, unicode_fonts=None):
+    """FPDF calls for one (already cleaned) line of body text."""
+    return [('set_font', ('Arial', '', 10))] + line_ops(line, font_metrics('', unicode_fonts), 10, 5)
+
+def _pdf_section_ops(section, clean=clean_text_for_pdf, unicode_fonts=None):
+    """Translate one contract section into the FPDF calls that draw it."""
+    ops = [('set_font', ('Arial', 'B', 12)), ('set_fill_color', (240, 240, 240))]
+    # Long headings wrap onto a second shaded line rather than being cut off
+    ops.extend(line_ops(clean(section.heading), font_metrics('B', unicode_fonts), 12, 8, 'L', 1))
+    ops.append(('ln', (2,)))
+    for line in section.body_lines():
+        ops.extend(_pdf_body_ops(clean(line.strip()), unicode_fonts))
+    return tuple(ops)
+
+# Static sections are laid out once per font set; every render replays these
+# FPDF calls instead of re-cleaning and re-measuring the same text.
+_STATIC_PDF_OPS = {}
+
+def _static_section_ops(section, unicode_fonts):
+    key = (section, tuple(sorted(unicode_fonts.items())) if unicode_fonts else None)
+    ops = _STATIC_PDF_OPS.get(key)
+    if ops is None:
+        sanitize = clean_text_for_unicode_pdf if unicode_fonts else clean_text_for_pdf
+        ops = _STATIC_PDF_OPS[key] = _pdf_section_ops(section, sanitize, unicode_fonts)
+    return ops
+
+def spooled_file():
+    """Binary temp file that lives in memory until it outgrows SPOOL_MAX_MEMORY."""
+    return tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+
+def create_professional_pdf(contract, unicode_fonts=None, profile=None, max_bytes=None):
+    """Render the contract as PDF bytes.
+
+    unicode_fonts ({style: ttf_path}) defaults to the fonts configured in the
+    environment (see pdf_fonts.py); without them text is reduced to latin-1.
+    profile is one of PDF_PROFILES (default $FREELANCE_SHIELD_PDF_PROFILE or
+    "standard"); with max_bytes, see fit_pdf().
+    """
+    if max_bytes is not None:
+        return fit_pdf(contract, max_bytes, profile, unicode_fonts)[0]
+    profile = _pdf_profile(profile)
+    if len(contract.annexure) > STREAMING_ANNEXURE_LINES:
+        with spooled_file() as spool:
+            write_professional_pdf(contract, spool, unicode_fonts, profile)
+            spool.seek(0)
+            return spool.read()
+    from fpdf import FPDF
+    started = time.perf_counter()
+    pdf = FPDF()
+    pdf.set_compression(True)
+    _draw_pdf(pdf, contract, unicode_fonts, profile)
+    data = pdf.output(dest='S').encode('latin-1', errors='replace')
+    _record_document("pdf", started, len(data), mode="memory", profile=profile)
+    return data
+
+def fit_pdf(contract, max_bytes, profile=None, unicode_fonts=None):
+    """Render with `profile`, stepping down to lighter profiles until the PDF is at most max_bytes.
+
+    Returns (data, profile used). Profiles whose saving on the logo can't bring
+    the file under budget are skipped without rendering; if none fits, the
+    lightest profile's output is returned and the caller can compare sizes.
+    """
+    names = list(PDF_PROFILES)
+    candidates = names[names.index(_pdf_profile(profile)):]
+    data = None
+    for name in candidates:
+        if data is not None and name != candidates[-1]:
+            expected = len(data) - _logo_bytes(rendered) + _logo_bytes(name)
+            if expected > max_bytes:
+                continue
+        data, rendered = create_professional_pdf(contract, unicode_fonts, name), name
+        if len(data) <= max_bytes:
+            increment("pdf_budget_total", result="fit", profile=name)
+            return data, name
+    increment("pdf_budget_total", result="over", profile=rendered)
+    return data, rendered
+
+def _pdf_profile(profile):
+    profile = profile or PDF_PROFILE
+    if profile not in PDF_PROFILES:
+        raise ValueError(f"Unknown PDF profile {profile!r}; expected one of {', '.join(PDF_PROFILES)}")
+    return profile
+
+def _pdf_logo(profile):
+    options = PDF_PROFILES[profile]
+    if options["logo_dpi"] is None:
+        return None
+    try:
+        return pdf_image_info(LOGO_PATH, dpi=options["logo_dpi"], fmt=options["logo_format"])
+    except Exception:
+        return None
+
+def _logo_streams(profile):
+    """Byte lengths of the image streams the logo adds with `profile` (image data, transparency mask)."""
+    logo = _pdf_logo(profile)
+    if not logo:
+        return []
+    return [len(logo["data"])] + ([len(logo["smask"])] if logo.get("smask") else [])
+
+def _logo_bytes(profile):
+    return sum(_logo_streams(profile))
+
+def write_professional_pdf(contract, fileobj, unicode_fonts=None, profile=None):
+    """Stream the PDF into a binary file object, one finished page at a time."""
+    from pdf_stream import SpoolingFPDF
+    profile = _pdf_profile(profile)
+    started = time.perf_counter()
+    pdf = SpoolingFPDF(fileobj)
+    pdf.set_compression(True)
+    _draw_pdf(pdf, contract, unicode_fonts, profile)
+    pdf.output()
+    _record_document("pdf", started, len(pdf.buffer), mode="stream", profile=profile)
+    return fileobj
+
+def _record_document(fmt, started, size, **labels):
+    """Render time and output size for the telemetry histograms (no document content)."""
+    observe("stage_seconds", time.perf_counter() - started, stage=fmt, **labels)
+    if size is not None:
+        observe("output_bytes", size, buckets=SIZE_BUCKETS, format=fmt, **labels)
+    increment("documents_total", format=fmt)
+
+def _draw_pdf(pdf, contract, unicode_fonts=None, profile="standard"):
+    from pdf_fonts import configured_fonts, install_unicode_fonts
+    unicode_fonts = unicode_fonts or configured_fonts()
+    sanitize = clean_text_for_unicode_pdf if unicode_fonts else clean_text_for_pdf
+    sanitize_seconds = 0.0
+    
+    def clean(text):
+        nonlocal sanitize_seconds
+        started = time.perf_counter()
+        text = sanitize(text)
+        sanitize_seconds += time.perf_counter() - started
+        return text
+    
+    if unicode_fonts:
+        install_unicode_fonts(pdf, unicode_fonts)
+    _replay(pdf, _pdf_ops(contract, clean, unicode_fonts, profile))
+    observe("stage_seconds", sanitize_seconds, stage="sanitize")
+
+def _pdf_ops(contract, clean, unicode_fonts, profile):
+    """Every FPDF call that draws the contract, in order, generated as it is replayed."""
+    yield from _agreement_ops(contract, clean, unicode_fonts, profile)
+    yield from _annexure_ops(contract.annexure, contract.provider_name, contract.client_name, clean, unicode_fonts)
+
+def _agreement_ops(contract, clean, unicode_fonts, profile):
+    yield 'add_page', ()
+    yield 'set_auto_page_break', (True, BOTTOM_MARGIN)
+    
+    logo = _pdf_logo(profile)
+    if logo:
+        yield place_cached_image, (logo, LOGO_PATH, 10, 8, 25)
+        yield 'ln', (25,)
+    else:
+        yield 'ln', (5,)
+    
+    yield 'set_font', ('Arial', 'B', 16)
+    yield 'cell', (0, 10, TITLE, 0, 1, 'C')
+    yield 'ln', (5,)
+    
+    yield 'set_font', ('Arial', '', 11)
+    yield 'cell', (0, 8, contract.date_line, 0, 1, 'C')
+    yield 'ln', (5,)
+    
+    for line in contract.party_lines():
+        yield from _pdf_body_ops(clean(line), unicode_fonts)
+    
+    for section in contract.sections:
+        yield 'ln', (2,)
+        if section.static:
+            yield from _static_section_ops(section, unicode_fonts)
+        else:
+            yield from _pdf_section_ops(section, clean, unicode_fonts)
+    
+    yield 'ln', (2,)
+    for text, kind in contract.signature_lines():
+        if kind == "text":
+            yield from _pdf_body_ops(clean(text), unicode_fonts)
+        else:
+            yield 'ln', (3,)
+            yield 'set_font', ('Arial', 'B', 11)
+            yield from line_ops(clean(text), font_metrics('B', unicode_fonts), 11, 6, 'L')
+
+def _annexure_ops(annexure, provider_name, client_name, clean, unicode_fonts):
+    """Annexure A on pages of its own, so its layout doesn't depend on the agreement's."""
+    regular = font_metrics('', unicode_fonts)
+    clean_provider = clean(provider_name)
+    clean_client = clean(client_name)
+    
+    yield 'add_page', ()
+    yield 'set_font', ('Arial', 'B', 14)
+    yield 'cell', (0, 10, ANNEXURE_TITLE, 0, 1, 'L')
+    yield 'ln', (5,)
+    yield 'set_font', ('Arial', '', 10)
+    # The annexure used to be one multi_cell(), which skips a final blank line
+    if len(annexure) > 1 and not annexure[-1].replace('\r', ''):
+        annexure = annexure[:-1]
+    for start in range(0, len(annexure), ANNEXURE_CHUNK_LINES):
+        chunk = [clean(line) for line in annexure[start:start + ANNEXURE_CHUNK_LINES]]
+        yield from paragraphs_ops(chunk, regular, 10, 5)
+    
+    yield 'ln', (10,)
+    yield 'cell', (0, 6, '_________________________________________________________________', 0, 1)
+    yield 'ln', (5,)
+    yield 'cell', (0, 6, 'Provider Signature: ________________________  Date: __________', 0, 1)
+    yield from line_ops(f'Name: {clean_provider}', regular, 10, 6)
+    yield 'ln', (5,)
+    yield 'cell', (0, 6, 'Client Signature: ________________________  Date: __________', 0, 1)
+    yield from line_ops(f'Name: {clean_client}', regular, 10, 6)
+
+def estimate_pdf(contract, profile=None, unicode_fonts=None):
+    """(pages, approximate bytes) of the PDF create_professional_pdf() would return, without rendering it.
+
+    The layout is replayed on a PageCounter, so the page count is the real
+    one. The size comes from a fitted model and leaves out embedded Unicode
+    font subsets.
+    """
+    from pdf_fonts import configured_fonts
+    profile = _pdf_profile(profile)
+    unicode_fonts = unicode_fonts or configured_fonts()
+    sanitize = clean_text_for_unicode_pdf if unicode_fonts else clean_text_for_pdf
+    with timed("stage_seconds", stage="estimate"):
+        counter = PageCounter().replay(_agreement_ops(contract, sanitize, unicode_fonts, profile))
+        counter.add(_annexure_layout(contract.annexure, contract.provider_name, contract.client_name, tuple(sorted((unicode_fonts or {}).items()))))
+    logo = _pdf_logo(profile)
+    return counter.pages, counter.estimated_bytes(_logo_streams(profile), transparency=bool(logo and logo.get("smask")))
+
+@functools.lru_cache(maxsize=16)
+def _annexure_layout(annexure, provider_name, client_name, unicode_fonts):
+    """PageCounter for the annexure pages alone, kept for the next estimate.
+
+    Laying out a long annexure dominates estimate_pdf(); live-preview edits to
+    the fee or the clauses leave it unchanged and get it from here.
+    """
+    unicode_fonts = dict(unicode_fonts) or None
+    sanitize = clean_text_for_unicode_pdf if unicode_fonts else clean_text_for_pdf
+    ops = _annexure_ops(annexure, provider_name, client_name, sanitize, unicode_fonts)
+    counter = PageCounter().replay([('set_auto_page_break', (True, BOTTOM_MARGIN))])
+    return counter.replay(ops)
+
+# --- DOCX RENDERER ---
+def docx_blocks(contract):
+    """Flatten the contract into the (kind, value) blocks laid out by both DOCX backends."""
+    yield "date", contract.date_line
+    yield "blank", ""
+    
+    for line in contract.party_lines():
+        yield "para", line
+    for section in contract.sections:
+        yield "heading", section.heading
+        for line in section.body_lines():
+            yield "para", line
+    for text, kind in contract.signature_lines():
+        yield ("para" if kind == "text" else "bold"), text
+    
+    yield "page_break", ""
+    yield "annexure_title", ANNEXURE_TITLE
+    
+    for line in contract.annexure:
+        if line.strip():
+            yield "para", line.strip()
+    
+    yield "blank", ""
+    yield "plain", '_' * 60
+    yield "signatures", (contract.provider_name, contract.client_name)
+
+def _render_python_docx(blocks, fileobj):
+    from docx import Document
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Pt, RGBColor
+    doc = Document()
+    title = doc.add_heading(TITLE, 0)
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    title_run = title.runs[0]
+    title_run.font.size = Pt(18)
+    title_run.font.color.rgb = RGBColor(37, 99, 235)
+    
+    for kind, value in blocks:
+        if kind == "para":
+            para = doc.add_paragraph(value)
+            para.runs[0].font.size = Pt(11)
+        elif kind == "heading":
+            heading = doc.add_heading(value, level=2)
+            heading_run = heading.runs[0]
+            heading_run.font.size = Pt(13)
+            heading_run.font.color.rgb = RGBColor(30, 41, 59)
+        elif kind == "bold":
+            sig_para = doc.add_paragraph(value)
+            sig_para.runs[0].font.size = Pt(11)
+            sig_para.runs[0].bold = True
+        elif kind == "blank":
+            doc.add_paragraph()
+        elif kind == "plain":
+            doc.add_paragraph(value)
+        elif kind == "date":
+            date_para = doc.add_paragraph()
+            date_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            date_run = date_para.add_run(value)
+            date_run.font.size = Pt(11)
+        elif kind == "page_break":
+            doc.add_page_break()
+        elif kind == "annexure_title":
+            annexure_title = doc.add_heading(value, 1)
+            annexure_title.runs[0].font.color.rgb = RGBColor(37, 99, 235)
+        elif kind == "signatures":
+            provider_name, client_name = value
+            sig_section = doc.add_paragraph()
+            sig_section.add_run(f'\nProvider Signature: _____________________ Date: __________\n')
+            sig_section.add_run(f'Name: {provider_name}\n\n')
+            sig_section.add_run(f'Client Signature: _____________________ Date: __________\n')
+            sig_section.add_run(f'Name: {client_name}')
+    
+    doc.save(fileobj)
+    return fileobj
+
+def create_professional_docx(contract, backend=None):
+    """Render the contract as .docx with the python-docx object model or the streaming writer.
+
+    Returns a binary file object positioned at the start. Like the PDF, an
+    annexure longer than STREAMING_ANNEXURE_LINES goes through a spooled
+    file, and unless a backend is asked for, through the "stream" backend.
+    """
+    if len(contract.annexure) > STREAMING_ANNEXURE_LINES:
+        buffer = write_professional_docx(contract, spooled_file(), backend or "stream")
+    else:
+        buffer = write_professional_docx(contract, io.BytesIO(), backend)
+    buffer.seek(0)
+    return buffer
+
+def write_professional_docx(contract, fileobj, backend=None):
+    """Write the .docx into a binary file object; only the "stream" backend keeps memory flat."""
+    backend = backend or DOCX_BACKEND
+    if backend not in DOCX_BACKENDS:
+        raise ValueError(f"Unknown DOCX backend: {backend!r} (expected one of {', '.join(DOCX_BACKENDS)})")
+    started = time.perf_counter()
+    blocks = docx_blocks(contract)
+    if backend == "stream":
+        write_docx(blocks, fileobj)
+    else:
+        _render_python_docx(blocks, fileobj)
+    try:
+        size = fileobj.tell()
+    except (AttributeError, OSError):
+        size = None
+    _record_document("docx", started, size, backend=backend)
+    return fileobj
+
+# --- TEMPLATES ---
+class _LiveTemplates(Mapping):
+    """{category: scope} from catalog.json; always the current revision (see catalog.py)."""
+
+    def __getitem__(self, category):
+        return current_catalog().templates[category]
+
+    def __iter__(self):
+        return iter(current_catalog().templates)
+
+    def __len__(self):
+        return len(current_catalog().templates)
+
+scope_templates = _LiveTemplates()
+# Load and validate now, so a broken catalog fails at startup rather than on the first request
+current_catalog()
+
+def get_smart_clauses(category, rate):
+    return current_catalog().clauses(category, rate)
+
+# --- CONTRACT MODEL ---
+# Clauses whose wording never depends on the inputs
+STATIC_CLAUSES = {
+    5: ("CONFIDENTIALITY", "Strict confidentiality for 2 years post-termination."),
+    6: ("ANTI-GHOSTING CLAUSE", "Provider responds within 1 business day. Client silence >14 days = Termination."),
+    9: ("FORCE MAJEURE", "Not liable for acts of God or internet failure."),
+    10: ("LIMITATION OF LIABILITY", "Liability limited to Total Fee paid."),
+    12: ("GST COMPLIANCE", "Client bears GST liability."),
+    13: ("STAMP DUTY", "Client responsible for stamp duty as per Indian Stamp Act, 1899."),
+}
+STATIC_SECTIONS = {
+    number: Section(number, title, (body,), static=True)
+    for number, (title, body) in STATIC_CLAUSES.items()
+}
+
+MSME_INTEREST_NOTE = "Late payments attract compound interest at 3x the Bank Rate (Section 16, MSMED Act, 2006)."
+
+def penalty_paragraph(payment, bank_rate, days_late, date=None):
+    """Worked example of the Section 16 interest on the balance (or the whole fee if paid upfront)."""
+    # numpy is only needed when the example is asked for
+    from msme_interest import RATE_MULTIPLIER, projected_interest
+    amount, label = (payment.balance_amount, "balance") if payment.balance_amount else (payment.total_fee, "fee")
+    interest = projected_interest(amount, days_late, bank_rate, date)
+    return (
+        f"Illustration: if the {label} of Rs. {amount:,} is paid {days_late} days late, interest at "
+        f"{RATE_MULTIPLIER}x the Bank Rate of {bank_rate:g}% ({RATE_MULTIPLIER * bank_rate:g}% p.a., compounded monthly) "
+        f"adds Rs. {round(interest):,}, making Rs. {round(amount + interest):,} payable."
+    )
+
+def prepare_scope(scope_text):
+    return scope_text.replace("₹", "Rs. ")
+
+def build_contract(freelancer_name, client_name, jurisdiction_city, project_fee, hourly_rate, advance_percent, gst_registered, category, scope_text, penalty_example=None, date=None):
+    """Assemble the ContractDocument that every renderer consumes.
+
+    penalty_example, a (bank_rate_percent, days_late) pair, adds a worked
+    late-payment interest figure to the Payment Terms.
+    """
+    with timed("stage_seconds", stage="assemble"):
+        return _build_contract(freelancer_name, client_name, jurisdiction_city, project_fee, hourly_rate, advance_percent, gst_registered, category, scope_text, penalty_example, date)
+
+def _build_contract(freelancer_name, client_name, jurisdiction_city, project_fee, hourly_rate, advance_percent, gst_registered, category, scope_text, penalty_example, date):
+    date = date or datetime.date.today()
+    payment = PaymentTerms(project_fee, advance_percent, bool(gst_registered))
+    payment_notes = (MSME_INTEREST_NOTE,)
+    if penalty_example:
+        payment_notes += (penalty_paragraph(payment, *penalty_example, date=date),)
+    smart = get_smart_clauses(category, f"Rs. {hourly_rate:,}")
+    sections = (
+        Section(1, "PAYMENT TERMS (MSME ACT COMPLIANCE)", payment_notes, payment.rows()),
+        Section(2, "ACCEPTANCE & REVISIONS", (smart["acceptance"],)),
+        Section(3, "IP RIGHTS", (smart["ip_rights"],)),
+        Section(4, "WARRANTY", (smart["warranty"],)),
+        STATIC_SECTIONS[5],
+        STATIC_SECTIONS[6],
+        Section(7, "CANCELLATION", (smart["cancellation"],)),
+        Section(8, "TERMINATION BY PROVIDER", (smart["termination"],)),
+        STATIC_SECTIONS[9],
+        STATIC_SECTIONS[10],
+        Section(11, "JURISDICTION", (f"Disputes subject to Arbitration in {jurisdiction_city}, India under Arbitration Act, 1996.",)),
+        STATIC_SECTIONS[12],
+        STATIC_SECTIONS[13],
+    )
+    annexure = tuple(prepare_scope(scope_text).replace("\r\n", "\n").split("\n"))
+    return ContractDocument(date, freelancer_name, client_name, category, payment, sections, annexure)
+
+def warm_up():
+    """Pay one-off costs (imports, fonts, logo decode) before real work arrives."""
+    # Warm-up renders are not user traffic, so they stay out of the telemetry
+    with TELEMETRY.suppressed():
+        contract = build_contract("Provider", "Client", "Bengaluru, Karnataka", 50000, 2000, 50, False, "💻 Web Development", "Warm up")
+        create_professional_pdf(contract)
+        create_professional_docx(contract)
+
+_prewarm_lock = threading.Lock()
+_prewarm_thread = None
+
+def prewarm_in_background():
+    """Start warm_up() on a daemon thread, once per process, and return that thread."""
+    global _prewarm_thread
+    with _prewarm_lock:
+        if _prewarm_thread is None:
+            _prewarm_thread = threading.Thread(target=_prewarm, name="renderer-prewarm", daemon=True)
+            _prewarm_thread.start()
+    return _prewarm_thread
+
+def _prewarm():
+    try:
+        warm_up()
+    except Exception:
+        # Only an optimization: the first real render will surface the same error to the user
+        logging.getLogger(__name__).exception("Renderer pre-warm failed")
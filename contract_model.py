@@ -0,0 +1,182 @@
+"""Structured contract document shared by the PDF, DOCX and preview renderers.
+
+A ContractDocument is built once per request (see contract_engine.build_contract)
+and is immutable and hashable, so it can be used as a cache key and compared
+section by section.
+"""
+import datetime
+from dataclasses import dataclass
+
+TITLE = "PROFESSIONAL SERVICE AGREEMENT"
+ANNEXURE_TITLE = "ANNEXURE A: SCOPE OF WORK"
+SECTION_RULE = "=" * 63
+
+@dataclass(frozen=True)
+class Section:
+    number: int
+    title: str
+    paragraphs: tuple = ()
+    # (label, value) pairs shown before the paragraphs, e.g. the payment table
+    rows: tuple = ()
+    # True when the wording never depends on the inputs
+    static: bool = False
+
+    @property
+    def heading(self):
+        return f"{self.number}. {self.title}"
+
+    def body_lines(self):
+        return [f"{label}: {value}" for label, value in self.rows] + list(self.paragraphs)
+
+    def to_text(self):
+        parts = [self.heading]
+        if self.rows:
+            parts.append("\n".join(f"{label}: {value}" for label, value in self.rows))
+        parts.extend(self.paragraphs)
+        return "\n\n".join(parts)
+
+@dataclass(frozen=True)
+class PaymentTerms:
+    total_fee: int
+    advance_percent: int
+    gst_exclusive: bool = False
+
+    @property
+    def advance_amount(self):
+        return int(self.total_fee * (self.advance_percent / 100))
+
+    @property
+    def balance_amount(self):
+        return self.total_fee - self.advance_amount
+
+    def rows(self):
+        total = f"Rs. {self.total_fee:,}" + (" (Exclusive of GST)" if self.gst_exclusive else "")
+        return (
+            ("Total Fee", total),
+            ("Advance", f"{self.advance_percent}% (Rs. {self.advance_amount:,})"),
+            ("Balance", f"Rs. {self.balance_amount:,}"),
+        )
+
+@dataclass(frozen=True)
+class ContractDocument:
+    date: datetime.date
+    provider_name: str
+    client_name: str
+    category: str
+    payment: PaymentTerms
+    sections: tuple
+    # Scope of Work, one entry per line as typed (blank lines included)
+    annexure: tuple
+
+    @property
+    def date_line(self):
+        return f"Date: {self.date.strftime('%B %d, %Y')}"
+
+    def party_lines(self):
+        return (
+            f'BETWEEN: {self.provider_name} ("Provider")',
+            f'AND: {self.client_name} ("Client")',
+        )
+
+    def signature_parties(self):
+        return (("PROVIDER", self.provider_name), ("CLIENT", self.client_name))
+
+    def signature_lines(self):
+        """(text, kind) pairs for the signature page; kind is "heading", "field" or "text"."""
+        lines = [("SIGNATURES", "heading")]
+        for role, name in self.signature_parties():
+            lines += [
+                (f"{role}:", "text"),
+                ("Signature: _____________________", "field"),
+                (f"Name: {name}", "text"),
+                ("Date: _____________________", "field"),
+            ]
+        return lines
+
+    @property
+    def annexure_text(self):
+        return "\n".join(self.annexure)
+
+    def agreement_parts(self):
+        """Part names of the agreement in document order (see changed_parts)."""
+        return ("header",) + tuple(section.number for section in self.sections) + ("signatures",)
+
+    def part_text(self, part):
+        """Plain text of one part: "header", a section number, "signatures" or "annexure"."""
+        if part == "header":
+            return f"{TITLE}\n\n{self.date_line}\n\n" + "\n".join(self.party_lines())
+        if part == "signatures":
+            signatures = "SIGNATURES\n"
+            for role, name in self.signature_parties():
+                signatures += f"\n{role}:\nSignature: _____________________\nName: {name}\nDate: _____________________\n"
+            return signatures
+        if part == "annexure":
+            return self.annexure_text
+        for section in self.sections:
+            if section.number == part:
+                return section.to_text()
+        raise KeyError(part)
+
+    def to_text(self):
+        """Plain-text rendering of the agreement (without the annexure)."""
+        return join_agreement(self.part_text(part) for part in self.agreement_parts())
+
+    def preview_text(self):
+        """Agreement followed by Annexure A, as shown in the app's preview box."""
+        return join_preview(self.to_text(), self.annexure_text)
+
+def join_agreement(part_texts):
+    return f"\n\n{SECTION_RULE}\n\n".join(part_texts)
+
+def join_preview(agreement_text, annexure_text):
+    return agreement_text + "\n\n" + "=" * 60 + "\nANNEXURE A\n" + "=" * 60 + "\n\n" + annexure_text
+
+def changed_parts(old, new):
+    """Names of the parts that differ between two documents.
+
+    Parts are "header" (date and parties), each section number, "signatures"
+    and "annexure". Comparing frozen dataclasses is cheap, so this is safe to
+    call on every rerun.
+    """
+    if old is None:
+        return {"header", "signatures", "annexure"} | {section.number for section in new.sections}
+    changed = set()
+    if (old.date, old.provider_name, old.client_name) != (new.date, new.provider_name, new.client_name):
+        changed.add("header")
+    if (old.provider_name, old.client_name) != (new.provider_name, new.client_name):
+        changed.add("signatures")
+    old_sections = {section.number: section for section in old.sections}
+    for section in new.sections:
+        if old_sections.get(section.number) != section:
+            changed.add(section.number)
+    if old.annexure != new.annexure:
+        changed.add("annexure")
+    return changed
+
+
+class PreviewMemo:
+    """Preview text kept part by part, so an edit only re-renders the parts it changed.
+
+    update() diffs the new document against the previous one with
+    changed_parts() and re-renders just those parts: a new fee touches the
+    Payment Terms section, a new scope only the annexure. The agreement text
+    is re-joined only when one of its parts changed.
+    """
+
+    def __init__(self):
+        self.document = None
+        self.texts = {}
+        self.agreement = ""
+        self.text = ""
+
+    def update(self, document):
+        """Bring the preview up to date with `document`; returns the set of re-rendered parts."""
+        changed = changed_parts(self.document, document)
+        parts = document.agreement_parts() + ("annexure",)
+        self.texts = {part: document.part_text(part) if part in changed else self.texts[part] for part in parts}
+        if changed - {"annexure"}:
+            self.agreement = join_agreement(self.texts[part] for part in document.agreement_parts())
+        if changed:
+            self.text = join_preview(self.agreement, self.texts["annexure"])
+        self.document = document
+        return changed
\ No newline at end of file
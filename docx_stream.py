@@ -0,0 +1,128 @@
+"""Streaming WordprocessingML writer, a fast alternative to the python-docx object tree.
+
+The package parts that never change (styles, theme, settings, content types)
+are taken from python-docx's default template and zipped once per process.
+Each render copies that prebuilt archive and streams a freshly written
+word/document.xml into it, so nothing is re-compressed and no per-paragraph
+objects are allocated.
+"""
+import importlib.util
+import io
+import os
+import re
+import threading
+import zipfile
+from xml.sax.saxutils import escape
+
+DOCUMENT_PART = "word/document.xml"
+
+_skeleton = None
+_skeleton_lock = threading.Lock()
+
+# XML 1.0 forbids most control characters; python-docx would raise on them.
+_INVALID_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# Run properties mirroring the fonts set by create_professional_docx
+_RPR_TITLE = '<w:rPr><w:color w:val="2563EB"/><w:sz w:val="36"/></w:rPr>'
+_RPR_BODY = '<w:rPr><w:sz w:val="22"/></w:rPr>'
+_RPR_BOLD = '<w:rPr><w:b/><w:sz w:val="22"/></w:rPr>'
+_RPR_HEADING = '<w:rPr><w:color w:val="1E293B"/><w:sz w:val="26"/></w:rPr>'
+_RPR_ANNEXURE = '<w:rPr><w:color w:val="2563EB"/></w:rPr>'
+
+def _template_path():
+    # Locate the template without importing python-docx itself
+    spec = importlib.util.find_spec("docx")
+    return os.path.join(os.path.dirname(spec.origin), "templates", "default.docx")
+
+def _build_skeleton():
+    with zipfile.ZipFile(_template_path()) as template:
+        document_xml = template.read(DOCUMENT_PART).decode("utf-8")
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as skeleton:
+            for item in template.infolist():
+                if item.filename != DOCUMENT_PART:
+                    skeleton.writestr(item.filename, template.read(item.filename))
+    opening = re.search(r"<w:document\b[^>]*>", document_xml).group(0)
+    sect_pr = re.sub(r">\s+<", "><", re.search(r"<w:sectPr\b.*?</w:sectPr>", document_xml, re.S).group(0))
+    head = (
+        "<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n"
+        + opening + "<w:body>"
+        + _paragraph("PROFESSIONAL SERVICE AGREEMENT", _RPR_TITLE, style="Title", center=True)
+    )
+    return {
+        "archive": buffer.getvalue(),
+        "head": head.encode("utf-8"),
+        "tail": (sect_pr + "</w:body></w:document>").encode("utf-8"),
+    }
+
+def skeleton():
+    """Prebuilt package parts and document.xml prologue/epilogue, built once per process."""
+    global _skeleton
+    if _skeleton is None:
+        with _skeleton_lock:
+            if _skeleton is None:
+                _skeleton = _build_skeleton()
+    return _skeleton
+
+def _text(text):
+    text = escape(_INVALID_XML.sub("", text))
+    return '<w:t xml:space="preserve">' + text.replace("\t", '</w:t><w:tab/><w:t xml:space="preserve">') + "</w:t>"
+
+def _paragraph(text, rpr="", style=None, center=False):
+    ppr = ""
+    if style or center:
+        ppr = "<w:pPr>" + (f'<w:pStyle w:val="{style}"/>' if style else "") + ('<w:jc w:val="center"/>' if center else "") + "</w:pPr>"
+    return f"<w:p>{ppr}<w:r>{rpr}{_text(text)}</w:r></w:p>"
+
+def _signature_block(provider_name, client_name):
+    runs = (
+        ("<w:br/>", "Provider Signature: _____________________ Date: __________", "<w:br/>"),
+        ("", f"Name: {provider_name}", "<w:br/><w:br/>"),
+        ("", "Client Signature: _____________________ Date: __________", "<w:br/>"),
+        ("", f"Name: {client_name}", ""),
+    )
+    return "<w:p>" + "".join(f"<w:r>{before}{_text(text)}{after}</w:r>" for before, text, after in runs) + "</w:p>"
+
+def block_xml(kind, value):
+    """WordprocessingML for one block yielded by contract_engine.docx_blocks()."""
+    if kind == "para":
+        return _paragraph(value, _RPR_BODY)
+    if kind == "heading":
+        return _paragraph(value, _RPR_HEADING, style="Heading2")
+    if kind == "bold":
+        return _paragraph(value, _RPR_BOLD)
+    if kind == "blank":
+        return "<w:p/>"
+    if kind == "plain":
+        return _paragraph(value)
+    if kind == "date":
+        return _paragraph(value, _RPR_BODY, center=True)
+    if kind == "page_break":
+        return '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+    if kind == "annexure_title":
+        return _paragraph(value, _RPR_ANNEXURE, style="Heading1")
+    if kind == "signatures":
+        return _signature_block(*value)
+    raise ValueError(f"Unknown DOCX block: {kind}")
+
+def write_docx(blocks, fileobj, chunk_size=64 * 1024):
+    """Stream `blocks` (after the title, which is part of the skeleton) into `fileobj` as a .docx."""
+    parts = skeleton()
+    fileobj.write(parts["archive"])
+    fileobj.seek(0)
+    with zipfile.ZipFile(fileobj, "a", zipfile.ZIP_DEFLATED) as archive:
+        with archive.open(DOCUMENT_PART, "w", force_zip64=True) as out:
+            out.write(parts["head"])
+            pending = []
+            size = 0
+            for kind, value in blocks:
+                xml = block_xml(kind, value)
+                pending.append(xml)
+                size += len(xml)
+                if size >= chunk_size:
+                    out.write("".join(pending).encode("utf-8"))
+                    pending.clear()
+                    size = 0
+            out.write("".join(pending).encode("utf-8"))
+            out.write(parts["tail"])
+    return fileobj
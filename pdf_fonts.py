@@ -0,0 +1,123 @@
+"""Opt-in Unicode TrueType font support for the PDF renderer.
+
+FPDF's built-in Arial only covers latin-1, so Devanagari and other non-Latin
+names come out as '?'. Point FREELANCE_SHIELD_PDF_FONT (and optionally
+FREELANCE_SHIELD_PDF_FONT_BOLD) at a TTF such as Noto Sans to embed a Unicode
+font instead. FPDF draws glyphs one by one and does no complex-script shaping,
+so conjuncts in Indic scripts may look simplified.
+
+Parsing a TTF and building its subset are pure Python and slow, so both are
+done at most once per process per font file (and per character set).
+"""
+import os
+import re
+import threading
+import types
+
+import fpdf.fpdf
+from fpdf.ttfonts import TTFontFile
+
+FONT_ENV = "FREELANCE_SHIELD_PDF_FONT"
+BOLD_FONT_ENV = "FREELANCE_SHIELD_PDF_FONT_BOLD"
+
+# Most recent subsets kept per process; contracts mostly share the same glyphs
+MAX_CACHED_SUBSETS = 64
+
+_lock = threading.Lock()
+_metrics = {}
+_subsets = {}
+
+def configured_fonts():
+    """{style: ttf_path} from the environment, or None when the Unicode path is off."""
+    regular = os.environ.get(FONT_ENV)
+    if not regular:
+        return None
+    return {"": regular, "B": os.environ.get(BOLD_FONT_ENV) or regular}
+
+def _load_metrics(path):
+    """Same font description FPDF.add_font(uni=True) builds, minus the per-document fields."""
+    if not os.path.isfile(path):
+        raise RuntimeError(f"TTF Font file not found: {path}")
+    key = (path, os.stat(path).st_mtime_ns)
+    font = _metrics.get(key)
+    if font is None:
+        with _lock:
+            font = _metrics.get(key)
+            if font is None:
+                ttf = TTFontFile()
+                ttf.getMetrics(path)
+                font = {
+                    "type": "TTF",
+                    "name": re.sub("[ ()]", "", ttf.fullName),
+                    "desc": {
+                        "Ascent": int(round(ttf.ascent, 0)),
+                        "Descent": int(round(ttf.descent, 0)),
+                        "CapHeight": int(round(ttf.capHeight, 0)),
+                        "Flags": ttf.flags,
+                        "FontBBox": "[%s %s %s %s]" % tuple(int(round(b, 0)) for b in ttf.bbox),
+                        "ItalicAngle": int(ttf.italicAngle),
+                        "StemV": int(round(ttf.stemV, 0)),
+                        "MissingWidth": int(round(ttf.defaultWidth, 0)),
+                    },
+                    "up": round(ttf.underlinePosition),
+                    "ut": round(ttf.underlineThickness),
+                    "cw": ttf.charWidths,
+                    "ttffile": path,
+                    "originalsize": os.stat(path).st_size,
+                }
+                _metrics[key] = font
+    return font
+
+class _CachedSubsetTTFontFile(TTFontFile):
+    """TTFontFile whose makeSubset() result is shared across documents in this process."""
+
+    def makeSubset(self, file, subset):
+        # Glyph order is internal to the embedded font, so sort to share subsets across documents
+        subset = sorted(set(subset))
+        key = (file, os.stat(file).st_mtime_ns, tuple(subset))
+        cached = _subsets.get(key)
+        if cached is None:
+            stream = TTFontFile.makeSubset(self, file, subset)
+            cached = (stream, self.codeToGlyph, self.maxUni)
+            with _lock:
+                if len(_subsets) >= MAX_CACHED_SUBSETS:
+                    _subsets.pop(next(iter(_subsets)))
+                _subsets[key] = cached
+        stream, self.codeToGlyph, self.maxUni = cached
+        return stream
+
+# FPDF._putfonts() builds subsets through the fpdf.fpdf module's TTFontFile. This
+# copy of it looks the name up in its own globals instead, so documents that
+# install_unicode_fonts() get the cached subsets and the library stays untouched.
+_putfonts_with_cached_subsets = types.FunctionType(
+    fpdf.fpdf.FPDF._putfonts.__code__,
+    dict(vars(fpdf.fpdf), TTFontFile=_CachedSubsetTTFontFile),
+    "_putfonts",
+)
+
+def install_unicode_fonts(pdf, fonts):
+    """Make `pdf` draw every Arial call with the configured TTF fonts.
+
+    The renderer's layout ops all ask for Arial, which FPDF stores under the
+    'helvetica' keys; registering the TTF under those keys swaps the font for
+    the whole document without touching the precomputed ops.
+    """
+    pdf._putfonts = types.MethodType(_putfonts_with_cached_subsets, pdf)
+    for style, path in fonts.items():
+        font = _load_metrics(path)
+        fontkey = "helvetica" + style
+        pdf.fonts[fontkey] = {
+            "i": len(pdf.fonts) + 1,
+            "type": font["type"],
+            "name": font["name"],
+            "desc": font["desc"],
+            "up": font["up"],
+            "ut": font["ut"],
+            "cw": font["cw"],
+            "ttffile": path,
+            "fontkey": fontkey,
+            "subset": list(range(0, 32)),
+            "unifilename": None,
+        }
+        pdf.font_files[fontkey] = {"length1": font["originalsize"], "type": "TTF", "ttffile": path}
+        pdf.font_files[path] = {"type": "TTF"}
@@ -0,0 +1,292 @@
+"""Line breaking and page counting for the PDF renderer, done ahead of FPDF.
+
+FPDF's multi_cell() measures text one character at a time: a dict lookup per
+character for the core fonts, a whole get_string_width() call per character
+for an embedded TTF. Here each font's glyph widths are a table indexed by
+code point. wrap_paragraphs() looks up and sums the widths of a whole batch
+of paragraphs in one numpy pass, then finds every break point by bisecting
+the running widths. It breaks exactly where multi_cell() would, and
+paragraph_ops() emits the same cell() calls and word spacing, so the PDF
+comes out byte-for-byte the same.
+
+The layout is plain data, so it can also be replayed on a PageCounter to
+predict the page count and file size without drawing anything.
+"""
+import bisect
+import zlib
+
+# FPDF('P', 'mm', 'A4') geometry, computed the way FPDF computes it so the
+# widths compare exactly with its own
+K = 72 / 25.4
+PAGE_WIDTH = 595.28 / K
+PAGE_HEIGHT = 841.89 / K
+# FPDF's default page margins (1 cm) and the padding inside each cell (1 mm)
+MARGIN = 28.35 / K
+CELL_MARGIN = MARGIN / 10.0
+# Bottom margin the renderer passes to set_auto_page_break()
+BOTTOM_MARGIN = 15
+# Width of a cell(0, ...) started at the left margin
+TEXT_WIDTH = PAGE_WIDTH - MARGIN - MARGIN
+
+class FontMetrics:
+    """Advance widths of one font in 1/1000 em, indexed by code point."""
+
+    __slots__ = ("widths", "missing", "rescaled", "_table")
+
+    def __init__(self, widths, missing=0, rescaled=False):
+        self.widths = widths
+        # Width of code points past the end of the table
+        self.missing = missing
+        # multi_cell() sums TTF widths as floats, each scaled to the font size and back
+        self.rescaled = rescaled
+        self._table = None
+
+    def advances(self, text):
+        widths = self.widths
+        if not text or ord(max(text)) < len(widths):
+            return map(widths.__getitem__, map(ord, text))
+        limit, missing = len(widths), self.missing
+        return (widths[code] if code < limit else missing for code in map(ord, text))
+
+    def width(self, text):
+        return sum(self.advances(text))
+
+    def line_width(self, text, font_size):
+        """width(), rounded the way multi_cell() rounds it when it sets word spacing."""
+        if not self.rescaled:
+            return self.width(text)
+        total = 0
+        for advance in self.advances(text):
+            total += advance * font_size / 1000.0 / font_size * 1000.0
+        return total
+
+    def measure(self, text):
+        """(running widths, space offsets) of `text`: [0, width of text[:1], ...] and where each ' ' is."""
+        import numpy as np
+        if self._table is None:
+            self._table = np.asarray(self.widths, dtype=np.int64)
+        table = self._table
+        codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        if codes.size and codes.max() >= len(table):
+            advances = np.where(codes < len(table), table[np.minimum(codes, len(table) - 1)], self.missing)
+        else:
+            advances = table[codes]
+        running = np.zeros(len(codes) + 1, dtype=np.int64)
+        np.cumsum(advances, out=running[1:])
+        return running.tolist(), np.flatnonzero(codes == 32).tolist()
+
+_core_metrics = {}
+_ttf_metrics = {}
+
+def font_metrics(style="", unicode_fonts=None):
+    """Metrics of the renderer's Arial in `style` ("" or "B"), or of the TTF that replaces it."""
+    if unicode_fonts:
+        from pdf_fonts import _load_metrics
+        path = unicode_fonts[style]
+        font = _load_metrics(path)
+        metrics = _ttf_metrics.get(path)
+        if metrics is None or metrics.widths is not font["cw"]:
+            # Same fallbacks as FPDF.get_string_width()
+            metrics = _ttf_metrics[path] = FontMetrics(font["cw"], font["desc"]["MissingWidth"] or 500, rescaled=True)
+        return metrics
+    metrics = _core_metrics.get(style)
+    if metrics is None:
+        from fpdf.fonts import fpdf_charwidths
+        # FPDF stores Arial under the Helvetica metrics
+        widths = fpdf_charwidths["helvetica" + style]
+        metrics = _core_metrics[style] = FontMetrics(tuple(widths.get(chr(code), 0) for code in range(256)))
+    return metrics
+
+def fits(text, metrics, size, width=TEXT_WIDTH):
+    """True if `text` is one line that a cell of `width` holds without wrapping."""
+    return "\n" not in text and metrics.width(text) <= _max_units(size, width)
+
+def _max_units(size, width):
+    return (width - 2 * CELL_MARGIN) * 1000.0 / (size / K)
+
+def wrap(text, metrics, size, width=TEXT_WIDTH, align="J"):
+    """Break `text` into lines as multi_cell(width, h, text, align=align) does at font size `size` (pt).
+
+    Returns [(line, spacing)]. spacing is the word spacing (mm) multi_cell()
+    sets before a justified line that breaks at a space, and None for the
+    lines it draws without any: the last line of each paragraph and words
+    split because they are wider than the cell.
+    """
+    text = text.replace("\r", "")
+    # multi_cell() ignores one trailing newline
+    if text.endswith("\n"):
+        text = text[:-1]
+    return [line for lines in wrap_paragraphs(text.split("\n"), metrics, size, width, align) for line in lines]
+
+def wrap_paragraphs(paragraphs, metrics, size, width=TEXT_WIDTH, align="J"):
+    """wrap() for a batch of single-line paragraphs, measured together; one list of lines per paragraph."""
+    font_size = size / K
+    wmax = _max_units(size, width)
+    justify = align == "J"
+    paragraphs = [paragraph.replace("\r", "") for paragraph in paragraphs]
+    text = "\n".join(paragraphs)
+    running, spaces = metrics.measure(text)
+    wrapped = []
+    start = 0
+    for paragraph in paragraphs:
+        stop = start + len(paragraph)
+        lines = []
+        while True:
+            # First character whose right edge passes the margin
+            end = bisect.bisect_right(running, running[start] + wmax, start) - 1
+            if end >= stop:
+                lines.append((text[start:stop], None))
+                break
+            last_space = bisect.bisect_right(spaces, end) - 1
+            if last_space < 0 or spaces[last_space] < start:
+                # No space to break at: split the word, keeping at least one character
+                end = max(end, start + 1)
+                lines.append((text[start:end], None))
+                start = end
+                continue
+            sep = spaces[last_space]
+            spacing = None
+            if justify:
+                gaps = last_space - bisect.bisect_left(spaces, start)
+                spacing = (wmax - metrics.line_width(text[start:sep], font_size)) / 1000.0 * font_size / gaps if gaps else 0
+            lines.append((text[start:sep], spacing))
+            start = sep + 1
+        wrapped.append(lines)
+        start = stop + 1
+    return wrapped
+
+def set_word_spacing(pdf, spacing, operator):
+    """Layout op: the word spacing multi_cell() sets between justified lines."""
+    pdf.ws = spacing
+    pdf._out(operator)
+
+def _cell_ops(lines, height, align, fill, width, ops):
+    current = 0
+    for line, spacing in lines:
+        if spacing is not None:
+            current = spacing
+            ops.append((set_word_spacing, (spacing, "%.3f Tw" % (spacing * K))))
+        elif current > 0:
+            current = 0
+            ops.append((set_word_spacing, (0, "0 Tw")))
+        ops.append(("cell", (width, height, line, 0, 2, align, fill)))
+    return ops
+
+def paragraph_ops(text, metrics, size, height, align="J", fill=0, width=TEXT_WIDTH):
+    """FPDF calls that draw `text` the way multi_cell(0, height, text, 0, align, fill) does.
+
+    Callable ops take the PDF as their first argument (see set_word_spacing).
+    """
+    return _cell_ops(wrap(text, metrics, size, width, align), height, align, fill, width, [])
+
+def paragraphs_ops(paragraphs, metrics, size, height, align="J", fill=0, width=TEXT_WIDTH):
+    """paragraph_ops() for each of a batch of single-line paragraphs, wrapped in one pass."""
+    ops = []
+    for lines in wrap_paragraphs(paragraphs, metrics, size, width, align):
+        _cell_ops(lines, height, align, fill, width, ops)
+    return ops
+
+def line_ops(text, metrics, size, height, align="J", fill=0):
+    """One cell(0, ...) for text that fits on a line, otherwise the wrapped paragraph."""
+    if fits(text, metrics, size):
+        return [("cell", (0, height, text, 0, 1, "" if align == "J" else align, fill))]
+    return paragraph_ops(text, metrics, size, height, align, fill)
+
+# --- PAGE COUNT ---
+# Size model: the fixed objects (catalog, fonts, xref), each page's objects,
+# each page's content stream rebuilt from the cells and deflated as FPDF does,
+# and each image's object wrapper. Fitted against rendered contracts with the
+# core fonts (within 2% from 3 to 280 pages, repetitive or varied text); it
+# leaves out embedded font subsets.
+BASE_BYTES = 970
+PAGE_BYTES = 260
+IMAGE_OBJECT_BYTES = 290
+# The /Group /Transparency entry every page gets once an image has an alpha mask
+TRANSPARENCY_PAGE_BYTES = 56
+
+class PageCounter:
+    """Stands in for FPDF when replaying layout ops: moves the cursor and counts pages, draws nothing."""
+
+    def __init__(self):
+        self.pages = 0
+        self.y = 0.0
+        self.lasth = 0
+        self.auto_page_break = True
+        self.page_break_trigger = PAGE_HEIGHT - 2 * MARGIN
+        self.font_size = 0.0
+        self.cells = 0
+        self.text_chars = 0
+        # Content stream of the current page, and the deflated size of the finished ones
+        self._stream = []
+        self.stream_bytes = 0
+
+    def replay(self, ops):
+        for op, args in ops:
+            # Callable ops (images, word spacing) never move the cursor
+            if not callable(op):
+                getattr(self, op)(*args)
+            elif op is set_word_spacing:
+                self._stream.append(args[1])
+        return self
+
+    def add(self, other):
+        """Count the pages laid out on `other`, which start on a page of their own, after these."""
+        self._finish_page()
+        self.pages += other.pages
+        self.cells += other.cells
+        self.text_chars += other.text_chars
+        # `other` may be shared (see contract_engine._annexure_layout), so it is only read
+        self.stream_bytes += other.stream_bytes + other._page_bytes()
+        self.y = other.y
+        return self
+
+    def _page_bytes(self):
+        """Deflated size of the current page's content stream so far."""
+        if not self._stream:
+            return 0
+        return len(zlib.compress("\n".join(self._stream).encode("latin-1", "replace")))
+
+    def _finish_page(self):
+        self.stream_bytes += self._page_bytes()
+        self._stream = []
+
+    def add_page(self, orientation=""):
+        self._finish_page()
+        self.pages += 1
+        self.y = MARGIN
+
+    def set_auto_page_break(self, auto, margin=0):
+        self.auto_page_break = auto
+        self.page_break_trigger = PAGE_HEIGHT - margin
+
+    def set_font(self, family, style="", size=0):
+        self.font_size = size / K
+
+    def set_fill_color(self, r, g=-1, b=-1):
+        pass
+
+    def ln(self, h=""):
+        self.y += self.lasth if isinstance(h, str) else h
+
+    def cell(self, w, h=0, txt="", border=0, ln=0, align="", fill=0, link=""):
+        if self.y + h > self.page_break_trigger and self.auto_page_break:
+            self.add_page()
+        if txt:
+            self.cells += 1
+            self.text_chars += len(txt)
+            # What FPDF's cell() writes, with left-aligned x: close enough for deflate
+            baseline = (PAGE_HEIGHT - (self.y + 0.5 * h + 0.3 * self.font_size)) * K
+            self._stream.append("BT %.2f %.2f Td (%s) Tj ET" % ((MARGIN + CELL_MARGIN) * K, baseline, txt))
+        self.lasth = h
+        if ln > 0:
+            self.y += h
+
+    def estimated_bytes(self, image_streams=(), transparency=False):
+        """Approximate file size; `image_streams` are the byte lengths of the embedded image data.
+
+        transparency: an image has an alpha mask, so every page carries a transparency group.
+        """
+        self._finish_page()
+        page_bytes = PAGE_BYTES + (TRANSPARENCY_PAGE_BYTES if transparency else 0)
+        content = self.pages * page_bytes + self.stream_bytes
+        return int(BASE_BYTES + content + sum(size + IMAGE_OBJECT_BYTES for size in image_streams))
@@ -0,0 +1,113 @@
+"""FPDF subclass that writes the document to a file as pages are finished.
+
+Stock FPDF keeps every page's content stream in `pdf.pages` and assembles the
+whole file in one string (`pdf.buffer`) that output() then copies again. For
+annexures hundreds of pages long that is several full copies of the document
+in memory. SpoolingFPDF writes each page object to the target file as soon as
+the next page starts, so only the page being drawn is held in memory.
+
+Page objects always get the numbers stock FPDF gives them (3, 5, 7, ... with
+their content streams in between), so the file layout is the same, just
+produced incrementally. Features the contract renderer doesn't use (links, the
+{nb} page-count alias) are rejected rather than silently mis-rendered.
+"""
+import zlib
+
+from fpdf import FPDF
+
+class _FileBuffer:
+    """Stands in for FPDF's string buffer: `+=` writes through, len() is the file offset."""
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.size = 0
+
+    def __iadd__(self, text):
+        data = text.encode("latin-1")
+        self.fileobj.write(data)
+        self.size += len(data)
+        return self
+
+    def __len__(self):
+        return self.size
+
+class SpoolingFPDF(FPDF):
+    """FPDF that streams finished pages into `fileobj` (any writable binary file)."""
+
+    def __init__(self, fileobj, *args, **kwargs):
+        FPDF.__init__(self, *args, **kwargs)
+        self.fileobj = fileobj
+        self.buffer = _FileBuffer(fileobj)
+        self._flushed_pages = 0
+        self._header_written = False
+
+    def alias_nb_pages(self, alias="{nb}"):
+        raise NotImplementedError("SpoolingFPDF writes pages before the page count is known")
+
+    def link(self, *args, **kwargs):
+        raise NotImplementedError("SpoolingFPDF does not support links")
+
+    def _beginpage(self, orientation):
+        # The previous page is complete once the next one starts
+        self._flush_pages(self.page)
+        FPDF._beginpage(self, orientation)
+
+    def _putheader(self):
+        if not self._header_written:
+            self._header_written = True
+            FPDF._putheader(self)
+
+    def _flush_pages(self, upto):
+        """Write page objects 1..upto that are still in memory, then drop their content."""
+        if upto <= self._flushed_pages:
+            return
+        # Pages are drawn before the document is closed, so the header has to go out first.
+        # Images with transparency bump pdf_version; the logo is placed on page 1 before this runs.
+        self._putheader()
+        if self.def_orientation == "P":
+            w_pt, h_pt = self.fw_pt, self.fh_pt
+        else:
+            w_pt, h_pt = self.fh_pt, self.fw_pt
+        state = self.state
+        # FPDF._out() appends to the current page while state == 2
+        self.state = 1
+        for n in range(self._flushed_pages + 1, upto + 1):
+            self._newobj()
+            self._out("<</Type /Page")
+            self._out("/Parent 1 0 R")
+            if n in self.orientation_changes:
+                self._out("/MediaBox [0 0 %.2f %.2f]" % (h_pt, w_pt))
+            self._out("/Resources 2 0 R")
+            if self.pdf_version > "1.3":
+                self._out("/Group <</Type /Group /S /Transparency /CS /DeviceRGB>>")
+            self._out("/Contents " + str(self.n + 1) + " 0 R>>")
+            self._out("endobj")
+            content = self.pages[n].encode("latin-1")
+            self.pages[n] = ""
+            if self.compress:
+                content = zlib.compress(content)
+            self._newobj()
+            self._out("<<" + ("/Filter /FlateDecode " if self.compress else "") + "/Length " + str(len(content)) + ">>")
+            self._putstream(content)
+            self._out("endobj")
+        self._flushed_pages = upto
+        self.state = state
+
+    def _putpages(self):
+        self._flush_pages(self.page)
+        nb = self.page
+        w_pt, h_pt = (self.fw_pt, self.fh_pt) if self.def_orientation == "P" else (self.fh_pt, self.fw_pt)
+        self.offsets[1] = len(self.buffer)
+        self._out("1 0 obj")
+        self._out("<</Type /Pages")
+        self._out("/Kids [" + "".join(str(3 + 2 * i) + " 0 R " for i in range(nb)) + "]")
+        self._out("/Count " + str(nb))
+        self._out("/MediaBox [0 0 %.2f %.2f]" % (w_pt, h_pt))
+        self._out(">>")
+        self._out("endobj")
+
+    def output(self, name="", dest=""):
+        """Finish the document; everything has already been written to `fileobj`."""
+        if self.state < 3:
+            self.close()
+        return self.fileobj
@@ -0,0 +1,254 @@
+"""Content-addressed, size-bounded LRU cache for rendered contracts.
+
+Small documents are kept in memory; large ones are spilled to temporary files
+and read back on demand, so a handful of long annexures can't crowd everyone
+else out of RAM. Entries expire after a period without use, and entries
+tagged with an owner (a browser session) are dropped as soon as every owner
+has released them.
+"""
+import collections
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+
+from catalog import current_catalog
+
+SPILL_ENV = "FREELANCE_SHIELD_SPILL_MB"
+TTL_ENV = "FREELANCE_SHIELD_CACHE_TTL"
+
+def contract_key(provider_name, client_name, jurisdiction, project_fee, hourly_rate, advance_percent, gst_registered, category, scope, penalty_example=None, date=None):
+    """Stable hash of everything that influences the generated documents.
+
+    Values are normalized to the types the renderers see, so e.g. 50000 and
+    50000.0 or CRLF and LF line endings map to the same entry.
+    """
+    date = date or datetime.date.today()
+    payload = [
+        str(provider_name),
+        str(client_name),
+        str(jurisdiction),
+        int(project_fee),
+        int(hourly_rate),
+        int(advance_percent),
+        bool(gst_registered),
+        str(category),
+        str(scope).replace("\r\n", "\n"),
+        date.isoformat(),
+        # Template and clause wording, so a catalog edit never serves stale documents
+        current_catalog().digest,
+    ]
+    if penalty_example:
+        payload.append([float(value) for value in penalty_example])
+    encoded = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+class _Spilled:
+    """Reference to an entry's bytes in a spill file."""
+    __slots__ = ("path", "size")
+
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+class _Entry:
+    __slots__ = ("data", "owners", "used")
+
+    def __init__(self, data, used):
+        self.data = data
+        self.owners = set()
+        self.used = used
+
+class ContractCache:
+    """Thread-safe LRU mapping of key -> bytes, bounded by total size in RAM and on disk.
+
+    Entries up to `spill_bytes` stay in memory (at most `max_bytes` in total);
+    larger ones go to files in a private temp directory (at most
+    `max_disk_bytes`, default $FREELANCE_SHIELD_SPILL_MB or 1024 MB). Entries
+    unused for `ttl` seconds (default $FREELANCE_SHIELD_CACHE_TTL or 1800)
+    are dropped.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, max_entry_bytes=None, spill_bytes=256 * 1024,
+                 max_disk_bytes=None, ttl=None, spill_dir=None):
+        self.max_bytes = max_bytes
+        self.spill_bytes = spill_bytes
+        if max_disk_bytes is None:
+            max_disk_bytes = int(os.environ.get(SPILL_ENV, 1024)) * 1024 * 1024
+        self.max_disk_bytes = max_disk_bytes
+        # A single huge contract should not flush everyone else's entries
+        self.max_entry_bytes = max_entry_bytes or max(max_bytes, max_disk_bytes) // 4
+        self.ttl = ttl if ttl is not None else float(os.environ.get(TTL_ENV, 1800))
+        self._spill_root = spill_dir
+        self._spill_dir = None
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.disk_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key, owner=None):
+        with self._lock:
+            self._expire(time.monotonic())
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._touch(key, entry, owner)
+            self.hits += 1
+            data = entry.data
+            if not isinstance(data, _Spilled):
+                return data
+            # Unlinking an open file is safe, so eviction can't pull it from under the read
+            f = open(data.path, "rb")
+        with f:
+            return f.read()
+
+    def size_of(self, key):
+        """Byte size of a cached entry, or None; a peek that doesn't count as a hit or refresh it."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry is None else len(entry.data)
+
+    def put(self, key, data, owner=None):
+        size = len(data)
+        if size > self.max_entry_bytes:
+            return
+        if size > self.spill_bytes:
+            # Written outside the lock; only the bookkeeping below is serialized
+            data = self._spill(data)
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            self._remove(key)
+            entry = self._entries[key] = _Entry(data, now)
+            if owner is not None:
+                entry.owners.add(owner)
+            if isinstance(data, _Spilled):
+                self.disk_bytes += size
+                self._evict(self.max_disk_bytes, spilled=True)
+            else:
+                self.current_bytes += size
+                self._evict(self.max_bytes, spilled=False)
+
+    def get_or_render(self, key, render, owner=None):
+        """Return cached bytes for `key`, calling `render()` and storing its result on a miss."""
+        data = self.get(key, owner)
+        if data is None:
+            data = render()
+            if hasattr(data, "read"):
+                # A rendered file object (BytesIO or a spooled file), positioned at the start
+                with data:
+                    data = data.read()
+            self.put(key, data, owner)
+        return data
+
+    def release(self, owner):
+        """Forget `owner`'s claim on its entries, dropping those nobody else holds."""
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if owner in entry.owners:
+                    entry.owners.discard(owner)
+                    if not entry.owners:
+                        self._remove(key)
+
+    def lease(self, owner):
+        """Object that releases `owner` when it is garbage collected (e.g. kept in session state)."""
+        return _Lease(self, owner)
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            spilled = sum(isinstance(entry.data, _Spilled) for entry in self._entries.values())
+            return {
+                "entries": len(self._entries),
+                "spilled_entries": spilled,
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "disk_bytes": self.disk_bytes,
+                "max_disk_bytes": self.max_disk_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    # The helpers below expect self._lock to be held
+    def _touch(self, key, entry, owner):
+        entry.used = time.monotonic()
+        if owner is not None:
+            entry.owners.add(owner)
+        self._entries.move_to_end(key)
+
+    def _expire(self, now):
+        # Entries are in order of last use, so the expired ones are all at the front
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if now - entry.used < self.ttl:
+                break
+            self._remove(key)
+            self.expirations += 1
+
+    def _evict(self, limit, spilled):
+        total = self.disk_bytes if spilled else self.current_bytes
+        for key in list(self._entries):
+            if total <= limit:
+                break
+            entry = self._entries[key]
+            if isinstance(entry.data, _Spilled) == spilled:
+                total -= len(entry.data)
+                self._remove(key)
+                self.evictions += 1
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        if isinstance(entry.data, _Spilled):
+            self.disk_bytes -= entry.data.size
+            try:
+                os.remove(entry.data.path)
+            except OSError:
+                pass
+        else:
+            self.current_bytes -= len(entry.data)
+
+    def _spill(self, data):
+        with self._lock:
+            if self._spill_dir is None:
+                self._spill_dir = tempfile.mkdtemp(prefix="freelance-shield-", dir=self._spill_root)
+                # Spill files never outlive the cache (or the process)
+                weakref.finalize(self, shutil.rmtree, self._spill_dir, ignore_errors=True)
+            spill_dir = self._spill_dir
+        fd, path = tempfile.mkstemp(dir=spill_dir)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        return _Spilled(path, len(data))
+
+class _Lease:
+    __slots__ = ("owner", "__weakref__")
+
+    def __init__(self, cache, owner):
+        self.owner = owner
+        weakref.finalize(self, cache.release, owner)
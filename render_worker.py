@@ -0,0 +1,116 @@
+"""Bounded background executor for contract rendering.
+
+Rendering is pure Python and CPU bound, so the app hands it to a small pool
+instead of running it in the Streamlit script thread. The number of jobs
+that may wait for a worker is capped: past that point submit() raises
+Overloaded straight away, so a burst of users gets a "try again" message
+instead of a server that stalls for everyone.
+"""
+import concurrent.futures
+import os
+import threading
+
+WORKERS_ENV = "FREELANCE_SHIELD_RENDER_WORKERS"
+QUEUE_ENV = "FREELANCE_SHIELD_RENDER_QUEUE"
+
+_current = threading.local()
+
+class Overloaded(RuntimeError):
+    """Raised by RenderWorker.submit() when the pending queue is full."""
+
+class RenderJob:
+    """A submitted render, with the progress the job function reports while it runs."""
+
+    def __init__(self, key):
+        self.key = key
+        self.future = None
+        self.progress = 0.0
+        self.stage = "Waiting for a free worker..."
+
+    def report(self, progress, stage=None):
+        self.progress = min(max(progress, 0.0), 1.0)
+        if stage:
+            self.stage = stage
+
+    def done(self):
+        return self.future.done()
+
+    def result(self, timeout=None):
+        return self.future.result(timeout)
+
+def report_progress(progress, stage=None):
+    """Update the progress of the job running in this thread (a no-op outside the worker)."""
+    job = getattr(_current, "job", None)
+    if job is not None:
+        job.report(progress, stage)
+
+class RenderWorker:
+    """Thread pool with a hard limit on queued jobs and de-duplication of identical requests."""
+
+    def __init__(self, max_workers=None, max_queue=None):
+        self.max_workers = max_workers or int(os.environ.get(WORKERS_ENV, 2))
+        # Jobs allowed to wait behind the running ones before new work is rejected
+        self.max_queue = max_queue if max_queue is not None else int(os.environ.get(QUEUE_ENV, 8))
+        self._executor = concurrent.futures.ThreadPoolExecutor(self.max_workers, thread_name_prefix="render")
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+
+    def _run(self, job, fn, args, kwargs):
+        _current.job = job
+        job.report(0.0, "Working...")
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.job = None
+            job.report(1.0)
+
+    def _finished(self, job):
+        with self._lock:
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+            self.completed += 1
+
+    def submit(self, key, fn, *args, **kwargs):
+        """Schedule fn(*args, **kwargs) and return its RenderJob.
+
+        A job already in flight under the same key is returned instead of
+        starting a second one (e.g. a double-clicked Generate button).
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None:
+                return job
+            if len(self._jobs) >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise Overloaded(f"{len(self._jobs)} renders already in progress")
+            job = RenderJob(key)
+            job.future = self._executor.submit(self._run, job, fn, args, kwargs)
+            self._jobs[key] = job
+        job.future.add_done_callback(lambda _: self._finished(job))
+        return job
+
+    def saturated(self):
+        """True while submit() would reject new work."""
+        with self._lock:
+            return len(self._jobs) >= self.max_workers + self.max_queue
+
+    def run(self, key, fn, *args, timeout=None, **kwargs):
+        """Submit and wait for the result; raises Overloaded when the queue is full."""
+        return self.submit(key, fn, *args, **kwargs).result(timeout)
+
+    def stats(self):
+        with self._lock:
+            in_flight = len(self._jobs)
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": in_flight,
+            "queued": max(in_flight - self.max_workers, 0),
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
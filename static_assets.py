@@ -0,0 +1,133 @@
+"""Size-optimized copies of the UI images, served from Streamlit's static directory.
+
+background.png (2 MB) and logo.png (1.4 MB) are far larger than anything the
+page displays. At startup each is resized to the sizes it is actually shown at
+and re-encoded (WebP with a JPEG/PNG fallback) into ./static, which Streamlit
+serves under app/static/ when server.enableStaticServing is on.
+
+File names carry a hash of the source image and the encoding settings, so a
+variant never changes under the same URL and can be cached indefinitely by
+the browser or a CDN in front of the app. If Pillow is missing or the
+directory cannot be written, the app falls back to the original files.
+"""
+import hashlib
+import io
+import os
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow ships with Streamlit, but the app must still start without it
+    Image = None
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(APP_DIR, "static")
+STATIC_URL = "app/static"
+
+BACKGROUND_PATH = os.path.join(APP_DIR, "background.png")
+BACKGROUND_URL = "https://raw.githubusercontent.com/mamamooze/freelance-shield/main/background.png"
+LOGO_PATH = os.path.join(APP_DIR, "logo.png")
+
+# (name, width_px, format, quality); the background sits behind a dark overlay, so
+# it tolerates stronger compression than the logo.
+BACKGROUND_VARIANTS = (
+    ("large_webp", 1536, "WEBP", 70),
+    ("large_jpeg", 1536, "JPEG", 75),
+    ("small_webp", 768, "WEBP", 65),
+    ("small_jpeg", 768, "JPEG", 70),
+)
+# The sidebar shows the logo at 120 px; 240 px keeps it sharp on high-DPI screens
+LOGO_VARIANTS = (
+    ("sidebar", 240, "WEBP", 85),
+    ("favicon", 64, "PNG", None),
+)
+
+_EXTENSIONS = {"WEBP": "webp", "JPEG": "jpg", "PNG": "png"}
+
+def _encode(im, width, fmt, quality):
+    if im.width > width:
+        im = im.resize((width, max(1, round(im.height * width / im.width))), Image.LANCZOS)
+    if fmt == "JPEG" and im.mode != "RGB":
+        im = im.convert("RGB")
+    buffer = io.BytesIO()
+    options = {"optimize": True} if fmt == "PNG" else {"quality": quality, "method": 6} if fmt == "WEBP" else {"quality": quality, "optimize": True, "progressive": True}
+    im.save(buffer, format=fmt, **options)
+    return buffer.getvalue()
+
+def _build_variants(source, variants):
+    """Write every variant of `source` into STATIC_DIR and return {name: filename}."""
+    with open(source, "rb") as f:
+        digest = hashlib.sha256(f.read())
+    stem = os.path.splitext(os.path.basename(source))[0]
+    files = {}
+    im = None
+    try:
+        for name, width, fmt, quality in variants:
+            variant_hash = digest.copy()
+            variant_hash.update(f"{width}:{fmt}:{quality}".encode())
+            filename = f"{stem}-{width}-{variant_hash.hexdigest()[:12]}.{_EXTENSIONS[fmt]}"
+            path = os.path.join(STATIC_DIR, filename)
+            if not os.path.exists(path):
+                # Only decode the source when a variant is actually missing (keeps restarts fast)
+                if im is None:
+                    im = Image.open(source)
+                    im.load()
+                # Write then rename so a concurrent server never serves a half-written file
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(_encode(im, width, fmt, quality))
+                os.replace(tmp_path, path)
+            files[name] = filename
+    finally:
+        if im is not None:
+            im.close()
+    return files
+
+def _prune(keep, prefixes):
+    """Delete variants left behind by earlier versions of the source images."""
+    for filename in os.listdir(STATIC_DIR):
+        if filename.startswith(prefixes) and filename not in keep:
+            try:
+                os.remove(os.path.join(STATIC_DIR, filename))
+            except OSError:
+                pass
+
+def build_static_assets():
+    """Generate the variants (if needed) and return the URLs/paths the UI should use.
+
+    Keys: "background" ({variant: url} or None), "logo" and "favicon" (file
+    paths for st.image / page_icon, or the original logo.png).
+    """
+    assets = {"background": None, "logo": LOGO_PATH, "favicon": LOGO_PATH}
+    if Image is None:
+        return assets
+    try:
+        os.makedirs(STATIC_DIR, exist_ok=True)
+        keep = set()
+        if os.path.exists(BACKGROUND_PATH):
+            files = _build_variants(BACKGROUND_PATH, BACKGROUND_VARIANTS)
+            assets["background"] = {name: f"{STATIC_URL}/{filename}" for name, filename in files.items()}
+            keep.update(files.values())
+        if os.path.exists(LOGO_PATH):
+            files = _build_variants(LOGO_PATH, LOGO_VARIANTS)
+            assets["logo"] = os.path.join(STATIC_DIR, files["sidebar"])
+            assets["favicon"] = os.path.join(STATIC_DIR, files["favicon"])
+            keep.update(files.values())
+        _prune(keep, ("background-", "logo-"))
+    except OSError:
+        return {"background": None, "logo": LOGO_PATH, "favicon": LOGO_PATH}
+    return assets
+
+def background_css(assets):
+    """CSS for the page background: the local variants when available, else the original image."""
+    overlay = "linear-gradient(rgba(10, 10, 20, 0.85), rgba(10, 10, 20, 0.90))"
+    urls = assets["background"]
+    if not urls:
+        return f'.stApp {{ background-image: {overlay}, url("{BACKGROUND_URL}"); }}'
+
+    def image_set(size):
+        # The plain JPEG declaration is kept for browsers without image-set() type() support
+        return (
+            f'background-image: {overlay}, url("{urls[size + "_jpeg"]}");'
+            f' background-image: {overlay}, image-set(url("{urls[size + "_webp"]}") type("image/webp"), url("{urls[size + "_jpeg"]}") type("image/jpeg"));'
+        )
+    return f".stApp {{ {image_set('large')} }} @media (max-width: 768px) {{ .stApp {{ {image_set('small')} }} }}"
@@ -0,0 +1,192 @@
+"""In-process performance telemetry: counters and fixed-bucket histograms.
+
+Only durations, byte sizes and counts are recorded, labelled with values from
+fixed sets (stage, format, backend). Names, fees, scope text and any other
+input never reach this module, so the privacy policy's "no logging" promise
+holds. Each observation is a bisect and a short lock, cheap enough to leave
+on permanently; nothing is written to disk or sent anywhere.
+"""
+import bisect
+import contextlib
+import threading
+import time
+
+PREFIX = "freelance_shield"
+
+# Seconds; covers a 50 µs text clean-up up to a 10,000-line python-docx render
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (10_000, 25_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000, 10_000_000, 25_000_000)
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style (count, sum, per-bucket counts)."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q):
+        """Estimate the q-quantile by linear interpolation inside its bucket.
+
+        The bucket edges are narrowed to the observed min/max, so sparse
+        histograms don't report values that were never seen.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = max(self.buckets[index - 1] if index else 0.0, self.min)
+                upper = min(self.buckets[index] if index < len(self.buckets) else self.max, self.max)
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+class Telemetry:
+    """Thread-safe registry of counters and histograms keyed by (name, labels)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._help = {}
+        self._local = threading.local()
+        self.started = time.time()
+
+    def describe(self, name, text):
+        self._help[name] = text
+
+    @contextlib.contextmanager
+    def suppressed(self):
+        """Ignore everything recorded by this thread inside the block (e.g. warm-up renders)."""
+        self._local.suppressed = True
+        try:
+            yield
+        finally:
+            self._local.suppressed = False
+
+    def increment(self, name, amount=1, **labels):
+        if getattr(self._local, "suppressed", False):
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, buckets=DURATION_BUCKETS, **labels):
+        if getattr(self._local, "suppressed", False):
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextlib.contextmanager
+    def timed(self, name, **labels):
+        """Observe the wall time of the `with` block in seconds, even if it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        """JSON-friendly view: counters and histogram summaries, with labels flattened into the key."""
+        with self._lock:
+            counters = {_series(name, labels): value for (name, labels), value in self._counters.items()}
+            histograms = {_series(name, labels): h.summary() for (name, labels), h in self._histograms.items()}
+        return {"uptime_seconds": time.time() - self.started, "counters": counters, "histograms": histograms}
+
+    def prometheus_text(self, gauges=None):
+        """Prometheus text exposition format (0.0.4); `gauges` adds {name: value} point-in-time values."""
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+            histograms = [(key, h.buckets, list(h.counts), h.count, h.sum) for key, h in histograms]
+        declared = set()
+
+        def declare(name, kind):
+            if name not in declared:
+                declared.add(name)
+                if name in self._help:
+                    lines.append(f"# HELP {PREFIX}_{name} {self._help[name]}")
+                lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+
+        for (name, labels), value in counters:
+            declare(name, "counter")
+            lines.append(f"{PREFIX}_{_series(name, labels)} {value}")
+        for (name, labels), buckets, counts, count, total in histograms:
+            declare(name, "histogram")
+            cumulative = 0
+            for bound, bucket_count in zip(buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{PREFIX}_{_series(name + '_bucket', labels + (('le', le),))} {cumulative}")
+            lines.append(f"{PREFIX}_{_series(name + '_count', labels)} {count}")
+            lines.append(f"{PREFIX}_{_series(name + '_sum', labels)} {total}")
+        for name, value in sorted((gauges or {}).items()):
+            declare(name, "gauge")
+            lines.append(f"{PREFIX}_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+def _series(name, labels):
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+# Process-wide registry used by the engine, the app and the API server
+TELEMETRY = Telemetry()
+TELEMETRY.describe("stage_seconds", "Time spent per generation stage.")
+TELEMETRY.describe("output_bytes", "Size of generated documents.")
+TELEMETRY.describe("reruns_total", "Streamlit script reruns by kind.")
+TELEMETRY.describe("documents_total", "Documents generated.")
+TELEMETRY.describe("http_responses_total", "API responses by HTTP status.")
+
+timed = TELEMETRY.timed
+observe = TELEMETRY.observe
+increment = TELEMETRY.increment
+
+def service_gauges(cache=None, worker=None):
+    """Point-in-time values from a ContractCache and/or RenderWorker, for prometheus_text()."""
+    gauges = {}
+    if cache is not None:
+        for key, value in cache.stats().items():
+            gauges[f"cache_{key}"] = value
+    if worker is not None:
+        for key, value in worker.stats().items():
+            gauges[f"render_worker_{key}"] = value
+    return gauges
@@ -0,0 +1,106 @@
+"""Status codes of the HTTP API, against a real server on a free port."""
+import http.client
+import json
+import os
+import socket
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api_server
+
+ROW = {"provider_name": "Amit Kumar", "client_name": "Tech Solutions", "category": "Web Development"}
+
+@pytest.fixture(scope="module")
+def server():
+    server = api_server.create_server(port=0, workers=1, queue=0, quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    server.service.worker.shutdown(wait=False)
+
+def connect(server):
+    return http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=30)
+
+def post(connection, path, payload):
+    connection.request("POST", path, body=json.dumps(payload), headers={"Content-Type": "application/json"})
+    response = connection.getresponse()
+    return response.status, response.read()
+
+def raw_request(server, head):
+    with socket.create_connection(("127.0.0.1", server.server_address[1]), timeout=10) as sock:
+        sock.sendall(head)
+        return int(sock.recv(4096).split(b" ", 2)[1])
+
+def test_pdf_and_docx(server):
+    connection = connect(server)
+    status, body = post(connection, "/v1/contracts?format=pdf", ROW)
+    assert status == 200 and body.startswith(b"%PDF")
+    status, body = post(connection, "/v1/contracts?format=docx", ROW)
+    assert status == 200 and body.startswith(b"PK")
+
+@pytest.mark.parametrize("path, payload", [
+    ("/v1/contracts?format=txt", ROW),
+    ("/v1/contracts?profile=huge", ROW),
+    ("/v1/contracts?max_bytes=lots", ROW),
+    ("/v1/contracts", ["not", "an", "object"]),
+    ("/v1/contracts", {"client_name": "No provider", "category": "Web Development"}),
+    ("/v1/contracts", dict(ROW, category="Astrology")),
+    ("/v1/contracts", dict(ROW, advance_percent=250)),
+    ("/v1/contracts", dict(ROW, project_fee=-1)),
+    ("/v1/contracts", dict(ROW, project_fee="1e999")),
+])
+def test_bad_requests_are_400(server, path, payload):
+    status, body = post(connect(server), path, payload)
+    assert status == 400
+    assert "error" in json.loads(body)
+
+def test_invalid_json_is_400(server):
+    connection = connect(server)
+    connection.request("POST", "/v1/contracts", body=b"{not json")
+    assert connection.getresponse().status == 400
+
+def test_unknown_path_is_404_and_connection_stays_usable(server):
+    connection = connect(server)
+    assert post(connection, "/v1/other", ROW)[0] == 404
+    # The server closed that connection; http.client reconnects transparently
+    connection.request("GET", "/healthz")
+    assert connection.getresponse().status == 200
+
+def test_missing_content_length_is_411(server):
+    assert raw_request(server, b"POST /v1/contracts HTTP/1.1\r\nHost: x\r\n\r\n") == 411
+
+def test_negative_content_length_is_400(server):
+    assert raw_request(server, b"POST /v1/contracts HTTP/1.1\r\nHost: x\r\nContent-Length: -1\r\n\r\n") == 400
+
+def test_oversized_body_is_413(server):
+    head = f"POST /v1/contracts HTTP/1.1\r\nHost: x\r\nContent-Length: {api_server.MAX_BODY_BYTES + 1}\r\n\r\n"
+    assert raw_request(server, head.encode()) == 413
+
+def test_full_queue_is_429_with_retry_after(server):
+    release = threading.Event()
+    busy = server.service.worker.submit("busy", release.wait, 10)
+    try:
+        connection = connect(server)
+        connection.request("POST", "/v1/contracts", body=json.dumps(dict(ROW, client_name="Queued Client")))
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 429
+        assert response.getheader("Retry-After") == str(api_server.RETRY_AFTER_SECONDS)
+    finally:
+        release.set()
+        busy.result(10)
+
+def test_health_and_metrics(server):
+    connection = connect(server)
+    connection.request("GET", "/healthz")
+    response = connection.getresponse()
+    assert response.status == 200 and json.loads(response.read())["status"] == "ok"
+    connection.request("GET", "/metrics")
+    response = connection.getresponse()
+    assert response.status == 200 and b"http_responses_total" in response.read()
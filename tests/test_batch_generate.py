@@ -0,0 +1,46 @@
+"""Row normalization shared by the batch generator and the HTTP API."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_generate import normalize_row, read_rows
+
+ROW = {"provider_name": "Amit Kumar", "client_name": "Tech Solutions", "category": "Web Development"}
+
+def test_defaults_and_category_label():
+    row = normalize_row(ROW)
+    assert row["category"] == "💻 Web Development"
+    assert (row["project_fee"], row["hourly_rate"], row["advance_percent"]) == (50000, 2000, 50)
+
+@pytest.mark.parametrize("field, value, message", [
+    ("project_fee", "abc", "project_fee must be a number, got 'abc'"),
+    ("hourly_rate", [1], "hourly_rate must be a number"),
+    ("project_fee", "1e999", "project_fee must be a non-negative number"),
+    ("project_fee", "nan", "project_fee must be a non-negative number"),
+    ("hourly_rate", -1, "hourly_rate must be a non-negative number"),
+    ("advance_percent", 250, "advance_percent must be between 0 and 100"),
+    ("category", "Astrology", "Unknown category"),
+])
+def test_bad_values_name_the_field(field, value, message):
+    with pytest.raises(ValueError, match=message.replace("(", r"\(").replace("[", r"\[")):
+        normalize_row(dict(ROW, **{field: value}))
+
+def test_json_scope_keeps_backslashes():
+    assert normalize_row(dict(ROW, scope="C:\\new folder"))["scope"] == "C:\\new folder"
+
+def test_csv_scope_unescapes_newlines(tmp_path):
+    path = tmp_path / "rows.csv"
+    path.write_text("provider_name,client_name,category,scope\nA,B,Web Development,one\\ntwo\n", encoding="utf-8")
+    [(number, row)] = list(read_rows(str(path)))
+    assert number == 2
+    assert normalize_row(row)["scope"] == "one\ntwo"
+
+def test_bad_jsonl_lines_are_yielded_as_errors(tmp_path):
+    path = tmp_path / "rows.jsonl"
+    path.write_text('{"provider_name": "A"}\n{broken\n', encoding="utf-8")
+    rows = list(read_rows(str(path)))
+    assert rows[0] == (1, {"provider_name": "A"})
+    assert rows[1][0] == 2 and isinstance(rows[1][1], ValueError)
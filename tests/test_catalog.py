@@ -0,0 +1,100 @@
+"""Catalog validation and hot reload: a broken edit must never replace the catalog in service."""
+import copy
+import json
+import logging
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import catalog
+from catalog import CLAUSE_KEYS, PLACEHOLDER, current_catalog, parse_catalog
+
+VALID = {
+    "version": 1,
+    "templates": [
+        {"category": "Design", "scope": "Logo"},
+        {"category": "Writing", "scope": "Articles"},
+    ],
+    "default_clauses": {key: f"Default {key}, overtime at Rs. {{rate}}/hr" for key in CLAUSE_KEYS},
+    "clause_rules": [{"categories": ["Design"], "overrides": {"warranty": "Design warranty"}}],
+}
+
+def encode(data):
+    return json.dumps(data).encode("utf-8")
+
+def edited(change):
+    data = copy.deepcopy(VALID)
+    change(data)
+    return encode(data)
+
+def test_valid_catalog():
+    parsed = parse_catalog(encode(VALID))
+    assert list(parsed.templates) == [PLACEHOLDER, "Design", "Writing"]
+    assert parsed.clauses("Design", "2,000")["warranty"] == "Design warranty"
+    assert parsed.clauses("Writing", "2,000")["warranty"] == "Default warranty, overtime at Rs. 2,000/hr"
+
+def test_repo_catalog_is_valid():
+    with open(catalog.CATALOG_PATH, "rb") as f:
+        parse_catalog(f.read())
+
+@pytest.mark.parametrize("change, message", [
+    (lambda d: d.update(version=2), "unsupported catalog version"),
+    (lambda d: d.update(templates=[]), "no templates"),
+    (lambda d: d["templates"].append({"category": "Design", "scope": "again"}), "repeats category"),
+    (lambda d: d["default_clauses"].pop("termination"), "missing termination"),
+    (lambda d: d["default_clauses"].update(extra="x"), "unknown clauses extra"),
+    (lambda d: d["default_clauses"].update(warranty="{fee}"), "placeholder other than"),
+    (lambda d: d["default_clauses"].update(acceptance=""), "'acceptance' is empty"),
+    (lambda d: d["clause_rules"][0]["overrides"].update(warranty="  \n"), "'warranty' is empty"),
+    (lambda d: d["clause_rules"].append({"categories": ["Nope"], "overrides": {}}), "unknown category"),
+    (lambda d: d["clause_rules"].append({"categories": ["Writing"], "overrides": {"bogus": "x"}}), "unknown clause"),
+    (lambda d: d["clause_rules"].append({"categories": ["Design"], "overrides": {"warranty": "twice"}}), "both override"),
+])
+def test_invalid_catalogs_are_rejected(change, message):
+    with pytest.raises(ValueError, match=message):
+        parse_catalog(edited(change))
+
+def test_invalid_json_is_rejected():
+    with pytest.raises(ValueError, match="not valid JSON"):
+        parse_catalog(b"{")
+
+@pytest.fixture
+def catalog_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(catalog, "MTIME_CHECK_INTERVAL", 0)
+    path = tmp_path / "catalog.json"
+    path.write_bytes(encode(VALID))
+    return path
+
+def rewrite(path, raw):
+    stat = path.stat()
+    path.write_bytes(raw)
+    # A new mtime even on file systems with coarse timestamps
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+def test_edits_are_reloaded(catalog_file):
+    first = current_catalog(str(catalog_file))
+    rewrite(catalog_file, edited(lambda d: d["templates"].append({"category": "Video", "scope": "Edit"})))
+    second = current_catalog(str(catalog_file))
+    assert second.digest != first.digest
+    assert "Video" in second.templates
+
+def test_broken_edit_keeps_last_good_revision(catalog_file, caplog):
+    good = current_catalog(str(catalog_file))
+    rewrite(catalog_file, edited(lambda d: d["default_clauses"].pop("termination")))
+    with caplog.at_level(logging.ERROR, logger="catalog"):
+        assert current_catalog(str(catalog_file)) is good
+    assert "is invalid" in caplog.text
+
+def test_missing_file_keeps_last_good_revision(catalog_file):
+    good = current_catalog(str(catalog_file))
+    catalog_file.unlink()
+    assert current_catalog(str(catalog_file)) is good
+
+def test_broken_catalog_fails_on_first_load(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_bytes(b"{")
+    with pytest.raises(ValueError):
+        current_catalog(str(path))
@@ -0,0 +1,71 @@
+"""Section 16 interest figures printed into contracts, checked by hand and against a per-invoice loop."""
+import calendar
+import datetime
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from msme_interest import add_months, projected_interest, section16_interest
+
+def _add_month(date, months):
+    year, month = divmod(date.month - 1 + months, 12)
+    year += date.year
+    month += 1
+    return datetime.date(year, month, min(date.day, calendar.monthrange(year, month)[1]))
+
+def reference_interest(amount, due, paid, rate_at):
+    """One invoice at a time: compound at each monthly rest, simple interest for the broken month."""
+    if paid <= due:
+        return 0.0
+    value, months = amount, 0
+    while _add_month(due, months + 1) <= paid:
+        value *= 1 + 3 * rate_at(_add_month(due, months)) / 100 / 12
+        months += 1
+    last_rest = _add_month(due, months)
+    value *= 1 + 3 * rate_at(last_rest) / 100 * (paid - last_rest).days / 365
+    return value - amount
+
+def test_one_month_at_flat_rate():
+    interest = section16_interest([100_000], ["2025-01-15"], ["2025-02-15"], 6.5)
+    assert interest[0] == pytest.approx(1625)
+
+def test_paid_on_or_before_due_date_owes_nothing():
+    interest = section16_interest([100_000, 100_000], ["2025-03-01", "2025-03-01"], ["2025-02-20", "2025-03-01"], 6.5)
+    assert interest.tolist() == [0.0, 0.0]
+
+def test_month_end_due_dates_clamp_to_shorter_months():
+    dates = np.array(["2025-01-31", "2024-01-31", "2025-03-31"], dtype="datetime64[D]")
+    assert add_months(dates, 1).astype(str).tolist() == ["2025-02-28", "2024-02-29", "2025-04-30"]
+    # Jan 31 -> Feb 28 is a whole month, not 28 days of simple interest
+    assert section16_interest([100_000], ["2025-01-31"], ["2025-02-28"], 6.5)[0] == pytest.approx(1625)
+
+def test_rate_change_applies_from_the_next_monthly_rest():
+    history = (["2024-01-01", "2025-02-01"], [6.5, 6.0])
+    interest = section16_interest([100_000], ["2025-01-15"], ["2025-03-15"], history)
+    # The rest starting Jan 15 uses 6.5%; the one starting Feb 15 uses 6.0%
+    assert interest[0] == pytest.approx(100_000 * (1.01625 * 1.015 - 1))
+
+def test_history_starting_after_the_due_date_is_rejected():
+    with pytest.raises(ValueError, match="Bank Rate history starts"):
+        section16_interest([100_000], ["2025-01-15"], ["2025-03-15"], (["2025-02-01"], [6.0]))
+
+def test_matches_per_invoice_loop():
+    history = (["2023-01-01", "2024-06-10", "2025-02-07"], [6.25, 6.75, 6.0])
+
+    def rate_at(date):
+        rates = [rate for start, rate in zip(*history) if datetime.date.fromisoformat(start) <= date]
+        return rates[-1]
+
+    rng = np.random.default_rng(16)
+    due = [datetime.date(2024, 1, 1) + datetime.timedelta(days=int(d)) for d in rng.integers(0, 500, 200)]
+    paid = [d + datetime.timedelta(days=int(late)) for d, late in zip(due, rng.integers(-30, 700, 200))]
+    amounts = rng.integers(1_000, 5_000_000, 200).astype(float)
+    expected = [reference_interest(a, d, p, rate_at) for a, d, p in zip(amounts, due, paid)]
+    assert section16_interest(amounts, due, paid, history) == pytest.approx(expected, rel=1e-9)
+
+def test_projected_interest_for_the_contract_example():
+    assert projected_interest(100_000, 31, 6.5, datetime.date(2025, 1, 15)) == pytest.approx(1625)
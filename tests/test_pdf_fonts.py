@@ -0,0 +1,29 @@
+"""Unicode TTF support: cached subsets without patching the fpdf library."""
+import glob
+import os
+import sys
+
+import fpdf.fpdf
+import pytest
+from fpdf.ttfonts import TTFontFile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import contract_engine
+import pdf_fonts
+
+FONTS = sorted(glob.glob("/usr/share/fonts/truetype/*/DejaVuSans.ttf") + glob.glob("/usr/share/fonts/TTF/DejaVuSans.ttf"))
+
+@pytest.mark.skipif(not FONTS, reason="DejaVu Sans is not installed")
+def test_unicode_render_uses_cached_subsets_without_patching_fpdf():
+    fonts = {"": FONTS[0], "B": FONTS[0]}
+    contract = contract_engine.build_contract(
+        "अमित कुमार", "Tech Solutions", "Bengaluru, Karnataka", 50000, 2000, 50, False, "💻 Web Development", "स्कोप",
+    )
+    pdf_fonts._subsets.clear()
+    first = contract_engine.create_professional_pdf(contract, unicode_fonts=fonts)
+    cached = len(pdf_fonts._subsets)
+    second = contract_engine.create_professional_pdf(contract, unicode_fonts=fonts)
+    assert cached and len(pdf_fonts._subsets) == cached
+    assert first.startswith(b"%PDF") and len(first) == len(second)
+    assert fpdf.fpdf.TTFontFile is TTFontFile
@@ -0,0 +1,128 @@
+"""Cache keys, LRU eviction, spill to disk, TTL expiry and session leases."""
+import datetime
+import gc
+import io
+import os
+import sys
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import render_cache
+from render_cache import ContractCache, contract_key
+
+INPUTS = ("Amit Kumar", "Tech Solutions", "Bengaluru, Karnataka", 50000, 2000, 50, False, "💻 Web Development", "Line 1\nLine 2")
+DAY = datetime.date(2025, 6, 30)
+
+def key(*changes, **kwargs):
+    values = list(INPUTS)
+    for index, value in changes:
+        values[index] = value
+    return contract_key(*values, date=kwargs.pop("date", DAY), **kwargs)
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(render_cache, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+def test_key_is_stable_across_equivalent_inputs():
+    assert key() == key()
+    assert key((3, 50000.0)) == key()
+    assert key((8, "Line 1\r\nLine 2")) == key()
+
+@pytest.mark.parametrize("index, value", [
+    (0, "Someone Else"), (1, "Other Client"), (2, "Mumbai, Maharashtra"), (3, 50001),
+    (4, 2001), (5, 30), (6, True), (7, "🎨 Graphic Design"), (8, "Line 1"),
+])
+def test_key_changes_with_every_input(index, value):
+    assert key((index, value)) != key()
+
+def test_key_changes_with_date_and_penalty():
+    assert key(date=DAY + datetime.timedelta(days=1)) != key()
+    assert key(penalty_example=(5.75, 90)) != key()
+    assert key(penalty_example=(5.75, 90)) != key(penalty_example=(6.0, 90))
+
+def test_lru_eviction_by_total_bytes():
+    cache = ContractCache(max_bytes=30, max_entry_bytes=30, spill_bytes=100, max_disk_bytes=0)
+    cache.put("a", b"x" * 10)
+    cache.put("b", b"x" * 10)
+    cache.put("c", b"x" * 10)
+    assert cache.get("a") is not None  # "b" is now the least recently used
+    cache.put("d", b"x" * 10)
+    assert "b" not in cache
+    assert all(k in cache for k in "acd")
+    assert cache.stats()["bytes"] == 30
+    assert cache.stats()["evictions"] == 1
+
+def test_oversized_entries_are_not_cached():
+    cache = ContractCache(max_bytes=100, max_entry_bytes=10, max_disk_bytes=0)
+    cache.put("big", b"x" * 11)
+    assert "big" not in cache
+
+def test_large_entries_spill_to_disk(tmp_path):
+    cache = ContractCache(max_bytes=100, spill_bytes=10, max_disk_bytes=1000, spill_dir=str(tmp_path))
+    cache.put("small", b"s" * 5)
+    cache.put("large", b"L" * 50)
+    assert cache.stats()["bytes"] == 5
+    assert cache.stats()["disk_bytes"] == 50
+    assert cache.get("large") == b"L" * 50
+    assert cache.size_of("large") == 50
+    spilled = [os.path.join(root, name) for root, _, names in os.walk(tmp_path) for name in names]
+    assert len(spilled) == 1
+    cache.clear()
+    assert not os.path.exists(spilled[0])
+    assert cache.stats()["disk_bytes"] == 0
+
+def test_spilled_entries_evict_by_disk_budget(tmp_path):
+    cache = ContractCache(max_bytes=100, max_entry_bytes=100, spill_bytes=10, max_disk_bytes=60, spill_dir=str(tmp_path))
+    cache.put("one", b"1" * 40)
+    cache.put("two", b"2" * 40)
+    assert "one" not in cache
+    assert cache.get("two") == b"2" * 40
+
+def test_entries_expire_after_ttl_without_use(clock):
+    cache = ContractCache(max_bytes=100, ttl=60, max_disk_bytes=0)
+    cache.put("a", b"a")
+    cache.put("b", b"b")
+    clock[0] += 50
+    assert cache.get("a") == b"a"  # refreshed; "b" is not
+    clock[0] += 20
+    assert cache.get("b") is None
+    assert cache.get("a") == b"a"
+    assert cache.stats()["expirations"] == 1
+
+def test_release_drops_entries_only_when_no_owner_is_left():
+    cache = ContractCache(max_bytes=100, max_disk_bytes=0)
+    cache.put("shared", b"s", owner="one")
+    cache.get("shared", owner="two")
+    cache.put("mine", b"m", owner="one")
+    cache.put("anyone", b"x")
+    cache.release("one")
+    assert "mine" not in cache
+    assert "shared" in cache
+    assert "anyone" in cache
+    cache.release("two")
+    assert "shared" not in cache
+
+def test_lease_releases_its_owner_when_collected():
+    cache = ContractCache(max_bytes=100, max_disk_bytes=0)
+    lease = cache.lease("session")
+    cache.put("doc", b"d", owner=lease.owner)
+    del lease
+    gc.collect()
+    assert "doc" not in cache
+
+def test_get_or_render_renders_once_and_reads_file_objects():
+    cache = ContractCache(max_bytes=100, max_disk_bytes=0)
+    calls = []
+
+    def render():
+        calls.append(1)
+        return io.BytesIO(b"pdf")
+
+    assert cache.get_or_render("k", render) == b"pdf"
+    assert cache.get_or_render("k", render) == b"pdf"
+    assert len(calls) == 1
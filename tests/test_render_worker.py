@@ -0,0 +1,89 @@
+"""Queue bound, de-duplication and progress reporting of the shared render worker."""
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from render_worker import Overloaded, RenderWorker, report_progress
+
+@pytest.fixture
+def worker():
+    worker = RenderWorker(max_workers=1, max_queue=1)
+    yield worker
+    worker.shutdown()
+
+def wait_idle(worker):
+    # Done callbacks free a job's slot just after its result is delivered
+    deadline = time.monotonic() + 5
+    while worker.stats()["in_flight"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+def blocked_job(release):
+    release.wait(5)
+    return "done"
+
+def test_rejects_work_past_workers_plus_queue(worker):
+    release = threading.Event()
+    running = worker.submit("a", blocked_job, release)
+    queued = worker.submit("b", blocked_job, release)
+    assert worker.saturated()
+    with pytest.raises(Overloaded):
+        worker.submit("c", blocked_job, release)
+    assert worker.stats()["rejected"] == 1
+    release.set()
+    assert running.result(5) == queued.result(5) == "done"
+    # Finished jobs free their slots
+    wait_idle(worker)
+    assert worker.run("c", lambda: "again", timeout=5) == "again"
+    assert not worker.saturated()
+
+def test_identical_keys_share_one_job(worker):
+    release = threading.Event()
+    calls = []
+
+    def job():
+        calls.append(1)
+        release.wait(5)
+        return len(calls)
+
+    first = worker.submit("same", job)
+    second = worker.submit("same", job)
+    assert first is second
+    release.set()
+    assert first.result(5) == 1
+    assert len(calls) == 1
+
+def test_run_times_out_without_cancelling_the_job(worker):
+    release = threading.Event()
+    with pytest.raises(TimeoutError):
+        worker.run("slow", blocked_job, release, timeout=0.05)
+    release.set()
+    wait_idle(worker)
+    assert worker.stats()["completed"] == 1
+
+def test_jobs_report_progress(worker):
+    seen = threading.Event()
+    release = threading.Event()
+
+    def job():
+        report_progress(0.5, "Halfway")
+        seen.set()
+        release.wait(5)
+
+    handle = worker.submit("progress", job)
+    assert seen.wait(5)
+    assert (handle.progress, handle.stage) == (0.5, "Halfway")
+    release.set()
+    handle.result(5)
+    assert handle.progress == 1.0
+
+def test_errors_reach_the_caller(worker):
+    def fail():
+        raise ValueError("broken")
+
+    with pytest.raises(ValueError, match="broken"):
+        worker.run("fail", fail, timeout=5)